@@ -5,9 +5,16 @@ Account health checker to diagnose rate limiting issues
 import os
 import time
 import json
+import orjson
 import random
+import re
+import requests
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 
 load_dotenv()
 
@@ -18,17 +25,175 @@ DECODO_HOST = os.getenv("DECODO_HOST", "isp.decodo.com")
 DECODO_PORTS_STR = os.getenv("DECODO_PORTS", "10001,10002,10003")
 DECODO_PORTS = [int(port.strip()) for port in DECODO_PORTS_STR.split(",")]
 
-def get_random_proxy_config():
-    """Get a random proxy configuration from available ports"""
-    port = random.choice(DECODO_PORTS)
-    return {
-        "server": f"http://{DECODO_HOST}:{port}",
-        "username": DECODO_USERNAME,
-        "password": DECODO_PASSWORD
-    }
-
-def check_account_health(account_type="primary"):
-    """Check if an account is healthy or rate limited"""
+def retry(attempts=2, base=0.5, jitter=0.3, exceptions=(requests.Timeout, PlaywrightTimeoutError)):
+    """Retry transient timeouts with jittered exponential backoff, so one dropped packet isn't reported as a dead proxy"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return fn(*args, **kwargs)
+                except exceptions:
+                    if attempt == attempts - 1:
+                        raise
+                    time.sleep(base * 2 ** attempt + random.uniform(0, jitter))
+        return wrapper
+    return decorator
+
+PROXY_PROBE_URL = "https://api.ipify.org"  # Answers with the bare IP as text
+FALLBACK_PROBE_URL = "https://httpbin.org/ip"  # JSON {"origin": ...}; only used if ipify itself errors
+PROBE_TIMEOUT_S = 5  # A healthy proxy answers in well under a second; dead ports shouldn't cost more
+RR_STATE_FILE = ".decodo_rr_state.json"  # Round-robin position, kept across runs
+
+def _new_probe_session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+    return session
+
+# One keep-alive session per port: each probe thread owns its session (requests.Session isn't
+# thread-safe) and retries reuse that port's pooled proxy connection
+_PORT_SESSIONS = {port: _new_probe_session() for port in DECODO_PORTS}
+
+@retry()
+def fetch_ip_through(session, proxy_url):
+    """Return the exit IP seen through proxy_url"""
+    proxies = {"http": proxy_url, "https": proxy_url}
+    response = session.get(PROXY_PROBE_URL, proxies=proxies, timeout=PROBE_TIMEOUT_S)
+    try:
+        response.raise_for_status()
+        return response.text.strip()
+    except requests.HTTPError:
+        # The proxy got through but ipify refused; ask httpbin instead
+        response = session.get(FALLBACK_PROBE_URL, proxies=proxies, timeout=PROBE_TIMEOUT_S)
+        response.raise_for_status()
+        return response.json().get("origin")
+
+def _proxy_candidates(port):
+    """(Playwright proxy config, requests proxy URL) pairs to try for a port: with auth, then without"""
+    server = f"{DECODO_HOST}:{port}"
+    return (
+        ({"server": f"http://{server}", "username": DECODO_USERNAME, "password": DECODO_PASSWORD},
+         f"http://{DECODO_USERNAME}:{DECODO_PASSWORD}@{server}"),
+        ({"server": f"http://{server}"}, f"http://{server}"),
+    )
+
+PROXY_CANDIDATES = {port: _proxy_candidates(port) for port in DECODO_PORTS}
+
+def check_decodo_connection(port_index):
+    """Probe one Decodo port (with auth, then without).
+    Returns (port, working proxy config or None, IP or error, seconds taken)."""
+    port = DECODO_PORTS[port_index]
+    error = None
+    start = time.perf_counter()
+    for proxy_config, proxy_url in PROXY_CANDIDATES[port]:
+        try:
+            ip = fetch_ip_through(_PORT_SESSIONS[port], proxy_url)
+            return port, proxy_config, ip, time.perf_counter() - start
+        except Exception as e:
+            error = e
+    return port, None, error, time.perf_counter() - start
+
+# Proxy health does change, so a probe is only reused for a while: long enough to cover
+# the primary and backup checks of one report, not a long-lived importer
+PROBE_CACHE_TTL_S = 300
+_probe_cache = {"at": None, "results": None}
+
+def probe_proxy_ports():
+    """Probe all Decodo ports concurrently, so the check costs one round-trip instead of one per port.
+    Results are reused for PROBE_CACHE_TTL_S seconds."""
+    if _probe_cache["results"] is not None and time.monotonic() - _probe_cache["at"] < PROBE_CACHE_TTL_S:
+        return _probe_cache["results"]
+    with ThreadPoolExecutor(max_workers=len(DECODO_PORTS)) as ex:
+        results = tuple(ex.map(check_decodo_connection, range(len(DECODO_PORTS))))
+    _probe_cache.update(at=time.monotonic(), results=results)
+    return results
+
+def next_port_index():
+    """Advance the persisted round-robin counter so checks (and runs) spread load across ports"""
+    try:
+        with open(RR_STATE_FILE, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = None
+    index = state.get("next") if isinstance(state, dict) else None
+    if not isinstance(index, int) or isinstance(index, bool):
+        index = random.randrange(len(DECODO_PORTS))  # Random start the first time (or after a bad state file)
+    try:
+        # Write-then-rename, so an interrupted write can't leave a truncated state file
+        tmp_path = f"{RR_STATE_FILE}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"next": index + 1}, f)
+        os.replace(tmp_path, RR_STATE_FILE)
+    except OSError as e:
+        print(f"⚠️  Could not save proxy rotation state: {e}")
+    return index
+
+# Must match scraper.LOGIN_USER_AGENT, so sessions are replayed under the UA that created them
+USER_AGENT = os.getenv("SCRAPER_USER_AGENT", "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+CHROMIUM_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=Translate,BackForwardCache',
+    '--disable-dev-shm-usage',
+]
+
+# Parsed session cookies per file, keyed on mtime so repeat checks don't re-read an unchanged file
+_COOKIE_CACHE = {}
+
+def load_session_cookies(session_file):
+    """Load cookies from a session file, reusing the parsed copy while the file is unchanged"""
+    mtime = os.path.getmtime(session_file)
+    cached = _COOKIE_CACHE.get(session_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(session_file, 'rb') as f:
+        cookies = orjson.loads(f.read())
+    _COOKIE_CACHE[session_file] = (mtime, cookies)
+    return cookies
+
+# X's error/rate-limit wording; searched case-insensitively instead of lowercasing the whole page
+ERROR_TEXT_RE = re.compile(r"rate limit|something went wrong|try again", re.I)
+
+# The checks only look at the DOM, so skip downloading what doesn't affect it
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOSTS = ("google-analytics.com", "doubleclick.net", "ads-twitter.com")
+
+def block_heavy_resources(route):
+    """Route handler that aborts media, styling and analytics requests"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or (urlparse(request.url).hostname or "").endswith(BLOCKED_HOSTS):
+        route.abort()
+    else:
+        route.continue_()
+
+def count_matches(page, selectors):
+    """Count matches for each selector in one evaluate call, instead of a round-trip (and element handles) per query"""
+    return page.evaluate("(sels) => sels.map(s => document.querySelectorAll(s).length)", selectors)
+
+def dump_page_for_debug(page, prefix):
+    """Save the page HTML for later analysis; skips near-empty pages. Returns the file name or None."""
+    content = page.content()
+    if len(content) < 1024:
+        return None
+    debug_file = f"{prefix}_{int(time.time())}.html"
+    with open(debug_file, 'wb', buffering=1024 * 1024) as f:
+        f.write(content.encode())
+    return debug_file
+
+def goto_committed(page, url, timeout=15000):
+    """Navigate and return once the response commits; callers wait on the selectors they need
+    rather than on X's trackers finishing the load. A navigation timeout propagates, so a page
+    that never commits isn't judged by the previous page's content."""
+    page.goto(url, wait_until="commit", timeout=timeout)
+
+@retry()
+def load_list_page(page, list_url):
+    """Navigate to the list and wait for its timeline cells (retried once on timeout)"""
+    goto_committed(page, list_url)
+    page.wait_for_selector("[data-testid='cellInnerDiv']", timeout=15000)
+
+def check_account_health(account_type="primary", browser=None):
+    """Check if an account is healthy or rate limited (in its own context on browser, if given)"""
     
     if account_type == "primary":
         email = os.getenv("X_EMAIL")
@@ -44,149 +209,164 @@ def check_account_health(account_type="primary"):
         print(f"❌ No session file found: {session_file}")
         return False
     
-    # Get proxy configuration
-    proxy_config = get_random_proxy_config()
-    print(f"🌐 Using proxy: {proxy_config['server']}")
-    
     # Test proxy connectivity first
     print("🔗 Testing proxy connectivity...")
+    working_configs = []
+    for port, proxy_config, info, elapsed in probe_proxy_ports():
+        if proxy_config:
+            auth_note = "" if "username" in proxy_config else " (without auth)"
+            print(f"✅ Port {port} working{auth_note} - IP: {info} ({elapsed:.2f}s)")
+            working_configs.append(proxy_config)
+        else:
+            print(f"❌ Port {port} failed after {elapsed:.2f}s: {info}")
+    
+    if not working_configs:
+        print("❌ Proxy completely failed")
+        return False
+    
+    proxy_config = working_configs[next_port_index() % len(working_configs)]
+    print(f"🌐 Using proxy: {proxy_config['server']}")
+    
+    pw = None
+    context = None
+    owns_browser = browser is None
     try:
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(headless=True)
-            test_context = browser.new_context(proxy=proxy_config)
-            test_page = test_context.new_page()
-            
-            # Test with a simple site first
-            test_page.goto("https://httpbin.org/ip", timeout=10000)
-            ip_info = test_page.text_content("body")
-            print(f"✅ Proxy working - IP: {ip_info.strip()}")
-            browser.close()
-    except Exception as proxy_error:
-        print(f"❌ Proxy test failed: {proxy_error}")
-        print("💡 Trying without authentication...")
+        if owns_browser:
+            pw = sync_playwright().start()
+            browser = pw.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        
+        # Create context with proxy configuration
+        context = browser.new_context(
+            proxy=proxy_config,
+            user_agent=USER_AGENT
+        )
         
-        # Try without auth if it fails
-        proxy_config_no_auth = {"server": proxy_config["server"]}
+        # Load session
+        context.add_cookies(load_session_cookies(session_file))
+        context.route("**/*", block_heavy_resources)
+        
+        page = context.new_page()
+        
+        # Test 1: Basic login check
+        print("\n🔍 Test 1: Basic login verification")
         try:
-            with sync_playwright() as pw:
-                browser = pw.chromium.launch(headless=True)
-                test_context = browser.new_context(proxy=proxy_config_no_auth)
-                test_page = test_context.new_page()
-                test_page.goto("https://httpbin.org/ip", timeout=10000)
-                ip_info = test_page.text_content("body")
-                print(f"✅ Proxy working without auth - IP: {ip_info.strip()}")
-                proxy_config = proxy_config_no_auth
-                browser.close()
+            print("🌐 Navigating to X.com...")
+            goto_committed(page, "https://x.com/home")
+            print("⏳ Waiting for page to load...")
+            try:
+                page.wait_for_selector("[data-testid='SideNav_AccountSwitcher_Button']", timeout=15000)
+                print("✅ Login verified - account is logged in")
+            except PlaywrightTimeoutError:
+                print("❌ Login failed - session may be expired")
+                return False
         except Exception as e:
-            print(f"❌ Proxy completely failed: {e}")
+            print(f"❌ Login test failed: {e}")
             return False
-    
-    try:
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(headless=True)
-            
-            # Create context with proxy configuration
-            context = browser.new_context(
-                proxy=proxy_config,
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            # Load session
-            with open(session_file, 'r') as f:
-                cookies = json.load(f)
-            context.add_cookies(cookies)
-            
-            page = context.new_page()
-            
-            # Test 1: Basic login check
-            print("\n🔍 Test 1: Basic login verification")
+        
+        # Test 2: Timeline access
+        print("\n🔍 Test 2: Timeline access")
+        try:
+            goto_committed(page, "https://x.com/home")
+            page.wait_for_selector("[data-testid='tweet']", timeout=10000)
+            tweet_count, = count_matches(page, ["[data-testid='tweet']"])
+            print(f"✅ Timeline accessible - found {tweet_count} tweets")
+        except Exception as e:
+            print(f"⚠️  Timeline access limited: {e}")
+        
+        # Test 3: List access (the critical test)
+        print("\n🔍 Test 3: List access (critical)")
+        list_url = "https://x.com/i/lists/1919380958723158457"
+        try:
+            # The content wait also covers the page load
             try:
-                print("🌐 Navigating to X.com...")
-                page.goto("https://x.com/home", timeout=30000)  # Increased timeout
-                print("⏳ Waiting for page to load...")
-                page.wait_for_load_state("domcontentloaded", timeout=15000)
+                load_list_page(page, list_url)
+                list_tweet_count, = count_matches(page, ["[data-testid='tweet']"])
                 
-                if page.query_selector("[data-testid='SideNav_AccountSwitcher_Button']"):
-                    print("✅ Login verified - account is logged in")
+                if list_tweet_count > 0:
+                    print(f"✅ List access HEALTHY - found {list_tweet_count} tweets")
+                    return True
                 else:
-                    print("❌ Login failed - session may be expired")
-                    return False
-            except Exception as e:
-                print(f"❌ Login test failed: {e}")
-                return False
-            
-            # Test 2: Timeline access
-            print("\n🔍 Test 2: Timeline access")
-            try:
-                page.goto("https://x.com/home", timeout=15000)
-                page.wait_for_selector("[data-testid='tweet']", timeout=10000)
-                tweets = page.query_selector_all("[data-testid='tweet']")
-                print(f"✅ Timeline accessible - found {len(tweets)} tweets")
-            except Exception as e:
-                print(f"⚠️  Timeline access limited: {e}")
-            
-            # Test 3: List access (the critical test)
-            print("\n🔍 Test 3: List access (critical)")
-            list_url = "https://x.com/i/lists/1919380958723158457"
-            try:
-                page.goto(list_url, timeout=15000)
-                
-                # Wait for content with shorter timeout
-                try:
-                    page.wait_for_selector("[data-testid='cellInnerDiv']", timeout=8000)
-                    list_tweets = page.query_selector_all("[data-testid='tweet']")
+                    print("⚠️  List loaded but no tweets visible")
                     
-                    if len(list_tweets) > 0:
-                        print(f"✅ List access HEALTHY - found {len(list_tweets)} tweets")
-                        return True
+                    # Check for rate limit indicators
+                    content = page.content()
+                    error_match = ERROR_TEXT_RE.search(content)
+                    if error_match and error_match.group(0).lower() == "rate limit":
+                        print("❌ RATE LIMITED - explicit rate limit message")
+                        return False
+                    elif error_match:
+                        print(f"❌ RATE LIMITED - X error page ('{error_match.group(0)}')")
+                        return False
+                    elif len(content) < 5000:
+                        print("❌ RATE LIMITED - minimal content loaded")
+                        return False
                     else:
-                        print("⚠️  List loaded but no tweets visible")
+                        print("⚠️  Unknown issue - content loaded but no tweets")
+                        return False
                         
-                        # Check for rate limit indicators
-                        content = page.content()
-                        if "rate limit" in content.lower():
-                            print("❌ RATE LIMITED - explicit rate limit message")
-                            return False
-                        elif len(content) < 5000:
-                            print("❌ RATE LIMITED - minimal content loaded")
-                            return False
-                        else:
-                            print("⚠️  Unknown issue - content loaded but no tweets")
-                            return False
-                            
-                except Exception as selector_error:
-                    print(f"❌ RATE LIMITED - selector timeout: {selector_error}")
-                    
-                    # Save page for analysis
-                    content = page.content()
-                    debug_file = f"{account_type}_health_check_{int(time.time())}.html"
-                    with open(debug_file, 'w') as f:
-                        f.write(content)
+            except Exception as selector_error:
+                print(f"❌ RATE LIMITED - selector timeout: {selector_error}")
+                
+                # Save page for analysis
+                debug_file = dump_page_for_debug(page, f"{account_type}_health_check")
+                if debug_file:
                     print(f"📄 Page saved for analysis: {debug_file}")
-                    
-                    return False
-                    
-            except Exception as e:
-                print(f"❌ RATE LIMITED - page load failed: {e}")
+                
                 return False
-            
+                
+        except Exception as e:
+            print(f"❌ RATE LIMITED - page load failed: {e}")
+            return False
+        
     except Exception as e:
         print(f"❌ Health check failed: {e}")
         return False
     finally:
         try:
-            browser.close()
+            if context:
+                context.close()
+            if owns_browser:
+                browser.close()
+                pw.stop()
         except:
             pass
 
+def _wait_for_probe(probe):
+    """Let the background probe finish before the checks touch the port sessions and probe cache"""
+    try:
+        probe.result()
+    except Exception as e:
+        print(f"⚠️  Background proxy probe failed ({e}); each check will probe again")
+
 def get_account_status_summary():
     """Get status of both accounts"""
     print("\n" + "=" * 80)
     print("🏥 COMPREHENSIVE ACCOUNT HEALTH REPORT")
     print("=" * 80)
     
-    primary_healthy = check_account_health("primary")
-    backup_healthy = check_account_health("backup")
+    # One Chromium for both checks; each account still gets its own context and proxy.
+    # The proxy probes run while it starts up, and both checks reuse their cached result.
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        probe = ex.submit(probe_proxy_ports)
+        shared_ok = False
+        try:
+            with sync_playwright() as pw:
+                browser = pw.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+                shared_ok = True
+                try:
+                    _wait_for_probe(probe)
+                    primary_healthy = check_account_health("primary", browser)
+                    backup_healthy = check_account_health("backup", browser)
+                finally:
+                    browser.close()
+        except Exception as e:
+            if shared_ok:
+                raise
+            # Outside the shared Playwright instance, each check launches (and reports a failure of) its own browser
+            print(f"⚠️  Shared browser unavailable ({e}), checking accounts separately...")
+            _wait_for_probe(probe)
+            primary_healthy = check_account_health("primary")
+            backup_healthy = check_account_health("backup")
     
     print("\n📊 SUMMARY:")
     print(f"Primary Account: {'✅ HEALTHY' if primary_healthy else '❌ RATE LIMITED'}")
@@ -167,8 +167,8 @@ def wait_for_connections_to_close(timeout=60):
     """Wait for connections to close naturally."""
     print(f"\nWaiting up to {timeout} seconds for connections to close naturally...")
     
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    deadline = time.monotonic() + timeout  # Unaffected by wall-clock adjustments
+    while time.monotonic() < deadline:
         sessions = show_connections()
         if sessions is False:
             print("Could not check connection status")
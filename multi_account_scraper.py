@@ -5,12 +5,14 @@ This is a simplified version that focuses on the core functionality.
 """
 
 import json
+import orjson
 import time
 import os
 import datetime
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from dotenv import load_dotenv
 import sys
+from page_utils import wait_for_any
 
 # Configuration
 DATA_DIR = os.getenv("DATA_DIR", ".")
@@ -65,8 +67,8 @@ class TwitterAccount:
         """Load cookies from session file"""
         if os.path.exists(self.session_file):
             try:
-                with open(self.session_file, "r") as f:
-                    cookies = json.load(f)
+                with open(self.session_file, "rb") as f:
+                    cookies = orjson.loads(f.read())
                 self.context.add_cookies(cookies)
                 return True
             except Exception as e:
@@ -77,8 +79,8 @@ class TwitterAccount:
         """Save cookies to session file"""
         try:
             cookies = self.context.cookies()
-            with open(self.session_file, "w") as f:
-                json.dump(cookies, f)
+            with open(self.session_file, "wb") as f:
+                f.write(orjson.dumps(cookies))
             print(f"✓ Session saved for {self.name}")
         except Exception as e:
             print(f"Error saving session for {self.name}: {e}")
@@ -102,13 +104,9 @@ class TwitterAccount:
                 'input[data-testid="ocfEnterTextTextInput"]'
             ]
             
-            for selector in email_selectors:
-                try:
-                    page.wait_for_selector(selector, timeout=5000)
-                    page.fill(selector, self.email)
-                    break
-                except:
-                    continue
+            selector = wait_for_any(page, email_selectors)
+            if selector:
+                page.fill(selector, self.email)
             
             # Click Next
             time.sleep(2)
@@ -117,22 +115,16 @@ class TwitterAccount:
             except:
                 page.locator('[data-testid="LoginForm_Login_Button"]').click()
             
-            time.sleep(3)
-            
-            # Fill password
+            # Fill password (the selector wait below covers the step transition)
             password_selectors = [
                 'input[name="password"]',
                 'input[type="password"]',
                 'input[autocomplete="current-password"]'
             ]
             
-            for selector in password_selectors:
-                try:
-                    page.wait_for_selector(selector, timeout=5000)
-                    page.fill(selector, self.password)
-                    break
-                except:
-                    continue
+            selector = wait_for_any(page, password_selectors)
+            if selector:
+                page.fill(selector, self.password)
             
             # Click Login
             time.sleep(2)
@@ -0,0 +1,17 @@
+"""
+Small Playwright page helpers shared by the scrapers (no other project imports, so it stays cheap to import).
+"""
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+def wait_for_any(page, selectors, timeout=5000):
+    """Wait once for whichever of selectors shows up (one union wait, not one timeout per selector).
+    Returns the first visible selector in list order, or None on timeout."""
+    try:
+        page.wait_for_selector(", ".join(selectors), timeout=timeout)
+    except PlaywrightTimeoutError:
+        return None
+    for selector in selectors:
+        if page.is_visible(selector):
+            return selector
+    return None
@@ -1,10 +1,12 @@
 import json
 import time
 import os
+import sys
 import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
 import hashlib
+from collections import Counter
 import requests
 
 @dataclass
@@ -27,6 +29,10 @@ class RateLimitEvent:
     ip_address: str
     user_agent: str
 
+# Short tag fields that repeat across every saved event; interned on load so each distinct
+# value is stored once and the Counter tallies in analyze_patterns hash it once
+INTERNED_EVENT_FIELDS = ("account_name", "account_type", "error_type", "ip_address", "user_agent")
+
 class RateLimitDebugger:
     def __init__(self, debug_dir: str = "debug_logs"):
         self.debug_dir = debug_dir
@@ -34,8 +40,7 @@ class RateLimitDebugger:
         self.html_dir = os.path.join(debug_dir, "html_captures")
         self.stats_file = os.path.join(debug_dir, "rate_limit_stats.json")
         
-        # Create directories
-        os.makedirs(debug_dir, exist_ok=True)
+        # Create directories (html_dir sits inside debug_dir, so one call creates both)
         os.makedirs(self.html_dir, exist_ok=True)
         
         # Load existing events
@@ -52,6 +57,10 @@ class RateLimitDebugger:
             if os.path.exists(self.events_file):
                 with open(self.events_file, 'r') as f:
                     events_data = json.load(f)
+                    for event in events_data:
+                        for field in INTERNED_EVENT_FIELDS:
+                            if isinstance(event.get(field), str):
+                                event[field] = sys.intern(event[field])
                     self.events = [RateLimitEvent(**event) for event in events_data]
         except Exception as e:
             print(f"Warning: Could not load existing events: {e}")
@@ -68,25 +77,20 @@ class RateLimitDebugger:
     
     def get_current_ip(self, context=None) -> str:
         """Get current external IP address, preferably through browser context"""
-        # Try to get IP through browser context first (respects proxy)
+        # Try to get IP through browser context first (respects proxy); the context's
+        # request client shares its proxy and cookies without opening and rendering a page
         if context:
             try:
-                page = context.new_page()
-                page.goto('https://httpbin.org/ip', timeout=10000)
-                ip_data = page.evaluate('() => JSON.parse(document.body.innerText)')
-                page.close()
-                return ip_data.get('origin', 'unknown')
+                response = context.request.get('https://api.ipify.org', timeout=10000)
+                if response.ok:
+                    return response.text().strip()
             except Exception as e:
-                try:
-                    page.close()
-                except:
-                    pass
                 print(f"Warning: Could not get IP through browser context: {e}")
         
         # Fallback to direct request (won't respect proxy)
         try:
-            response = requests.get('https://httpbin.org/ip', timeout=5)
-            return response.json().get('origin', 'unknown')
+            response = requests.get('https://api.ipify.org', timeout=5)
+            return response.text.strip() if response.ok else 'unknown'
         except:
             return 'unknown'
     
@@ -97,10 +101,11 @@ class RateLimitDebugger:
                                 url: str,
                                 error_type: str,
                                 error_message: str,
-                                page_content: str = None) -> RateLimitEvent:
-        """Capture a comprehensive rate limit event"""
+                                page_content: Union[str, bytes] = None,
+                                timestamp: Optional[float] = None) -> RateLimitEvent:
+        """Capture a comprehensive rate limit event (timestamp: epoch seconds, defaults to now)"""
         
-        current_time = time.time()
+        current_time = timestamp if timestamp is not None else time.time()
         
         # Get page HTML if not provided
         if page_content is None:
@@ -109,15 +114,18 @@ class RateLimitDebugger:
             except:
                 page_content = ""
         
+        # Encode once: the same bytes feed the dedup hash and the saved file
+        page_bytes = page_content if isinstance(page_content, bytes) else page_content.encode('utf-8')
+        
         # Create HTML hash for deduplication
-        html_hash = hashlib.md5(page_content.encode()).hexdigest()
+        html_hash = hashlib.md5(page_bytes).hexdigest()
         
         # Save HTML to file
         html_filename = f"{account_name}_{int(current_time)}_{html_hash[:8]}.html"
         html_path = os.path.join(self.html_dir, html_filename)
         try:
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(page_content)
+            with open(html_path, 'wb') as f:
+                f.write(page_bytes)
         except Exception as e:
             print(f"Warning: Could not save HTML: {e}")
         
@@ -230,40 +238,25 @@ class RateLimitDebugger:
         if not self.events:
             return {"error": "No events to analyze"}
         
+        events = self.events
+        request_counts = [e.request_count_since_success for e in events]
+        
+        # Tally each field in one pass per field, instead of re-indexing the analysis dict per event
         analysis = {
-            "total_events": len(self.events),
-            "accounts_affected": len(set(e.account_name for e in self.events)),
-            "error_types": {},
-            "ip_addresses": {},
+            "total_events": len(events),
+            "accounts_affected": len({e.account_name for e in events}),
+            "error_types": dict(Counter(e.error_type for e in events)),
+            "ip_addresses": dict(Counter(e.ip_address for e in events)),
             "time_patterns": {},
-            "request_count_patterns": {},
-            "common_html_patterns": {},
-            "recommendations": []
-        }
-        
-        # Analyze error types
-        for event in self.events:
-            analysis["error_types"][event.error_type] = analysis["error_types"].get(event.error_type, 0) + 1
-            analysis["ip_addresses"][event.ip_address] = analysis["ip_addresses"].get(event.ip_address, 0) + 1
-        
-        # Analyze request count patterns
-        request_counts = [e.request_count_since_success for e in self.events]
-        if request_counts:
-            analysis["request_count_patterns"] = {
+            "request_count_patterns": {
                 "min": min(request_counts),
                 "max": max(request_counts),
                 "avg": sum(request_counts) / len(request_counts),
-                "common_counts": {}
-            }
-            
-            for count in request_counts:
-                analysis["request_count_patterns"]["common_counts"][count] = \
-                    analysis["request_count_patterns"]["common_counts"].get(count, 0) + 1
-        
-        # Analyze HTML patterns
-        html_hashes = [e.page_html_hash for e in self.events]
-        for hash_val in html_hashes:
-            analysis["common_html_patterns"][hash_val] = analysis["common_html_patterns"].get(hash_val, 0) + 1
+                "common_counts": dict(Counter(request_counts))
+            },
+            "common_html_patterns": dict(Counter(e.page_html_hash for e in events)),
+            "recommendations": []
+        }
         
         # Generate recommendations
         if len(analysis["ip_addresses"]) == 1:
@@ -1,32 +1,90 @@
 import json
+import orjson
 import time
 import os
 import datetime
 import argparse
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extras import execute_values
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 import uuid
 import requests
 import random
 import sys
-from bs4 import BeautifulSoup
 import re
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from heapq import nlargest
+from operator import itemgetter
+from page_utils import wait_for_any
 
 # Use data directory for persistence in Docker
 DATA_DIR = os.getenv("DATA_DIR", ".")
 SESSION_FILE = os.path.join(DATA_DIR, "x_session.json")
 TWEETS_FILE = os.path.join(DATA_DIR, "tweets.json")
 LAST_ID_FILE = os.path.join(DATA_DIR, "last_tweet_id.txt")
+PW_PROFILE_DIR = os.path.join(DATA_DIR, "pw_profile")  # Persistent Chromium profile for --once runs
 MAX_TWEETS_HISTORY = 500  # Maximum number of tweets to keep in tweets.json
+_BY_ID = itemgetter("_id_int")  # Sort key for tweets, using the ID parsed once at extraction
+_TIMELINE_TAG = "ListLatestTweetsTimeline"  # Only these XHRs carry list tweets
+_LOGGED_IN_URL = re.compile(r"https://(www\.)?x\.com/home\b.*")  # Where X lands after a successful login (not /i/flow/login)
+# Last-resort user field lookups over a serialized tweet
+_SCREEN_NAME_RE = re.compile(r'"screen_name":\s*"([^"]*)"')
+_NAME_RE = re.compile(r'"name":\s*"([^"]*)"')
+DEBUG_LOG = os.getenv("LOG_LEVEL", "INFO").upper() == "DEBUG"  # Per-item dumps (XHR structure, DB rows)
 
 # Custom Exception for page load failures
 class PageLoadError(Exception):
     pass
 
+# Set on SIGTERM so monitor waits return immediately instead of sleeping out the interval
+_stop = threading.Event()
+# Wakes the monitor's between-cycle wait early, either to stop or to check for tweets right away
+_wakeup = threading.Event()
+
+def _request_stop(signum, frame):
+    print(f"\nReceived signal {signum}. Stopping after the current step...")
+    _stop.set()
+    _wakeup.set()
+
+def _request_check_now(signum, frame):
+    print(f"\nReceived signal {signum}. Checking for new tweets now...")
+    _wakeup.set()
+
+def _install_stop_handler():
+    """Route SIGTERM (e.g. docker stop) to the stop event and SIGUSR1 to an immediate check.
+
+    SIGINT keeps raising KeyboardInterrupt.
+    """
+    try:
+        signal.signal(signal.SIGTERM, _request_stop)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, _request_check_now)
+    except ValueError:
+        # signal.signal only works from the main thread
+        pass
+
+def _next_backoff(attempt, cap=60):
+    """Full-jitter exponential backoff: a random delay in [0, min(cap, 2**attempt)] seconds."""
+    return random.uniform(0, min(cap, 2 ** attempt))
+
+def _wait_for_next_cycle(timeout):
+    """Block until the next cycle is due or a signal wakes us. Returns True if a stop was requested."""
+    _wakeup.wait(timeout)
+    _wakeup.clear()
+    return _stop.is_set()
+
 load_dotenv()
 
+# UA for the login browsers, so the saved session is always issued to the same fingerprint
+# (account_health_checker.USER_AGENT uses the same default to replay it)
+LOGIN_USER_AGENT = os.getenv("SCRAPER_USER_AGENT", "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
 # Decodo proxy config (from account_health_checker.py)
 DECODO_USERNAME = os.getenv("DECODO_USERNAME", "sp5v4mxxv9")
 DECODO_PASSWORD = os.getenv("DECODO_PASSWORD", "ff9tilito8IEq9E_1Y")
@@ -34,17 +92,24 @@ DECODO_HOST = os.getenv("DECODO_HOST", "isp.decodo.com")
 DECODO_PORTS_STR = os.getenv("DECODO_PORTS", "10001,10002,10003")
 DECODO_PORTS = [int(port.strip()) for port in DECODO_PORTS_STR.split(",")]
 
+# Playwright proxy settings per port, built once
+PW_PROXY_BY_PORT = {
+    port: {"server": f"http://{DECODO_HOST}:{port}", "username": DECODO_USERNAME, "password": DECODO_PASSWORD}
+    for port in DECODO_PORTS
+}
+
 def get_random_proxy_config():
-    port = random.choice(DECODO_PORTS)
-    return {
-        "server": f"http://{DECODO_HOST}:{port}",
-        "username": DECODO_USERNAME,
-        "password": DECODO_PASSWORD
-    }
+    return PW_PROXY_BY_PORT[random.choice(DECODO_PORTS)]
+
+# Either element means the page is showing a logged-in X session
+_LOGGED_IN_SELECTORS = ["[data-testid='SideNav_AccountSwitcher_Button']", "[data-testid='tweet']"]
+
+def _is_logged_in_page(page):
+    """Check all logged-in markers in a single evaluate round-trip"""
+    return page.evaluate("(sels) => sels.some(s => document.querySelector(s) !== null)", _LOGGED_IN_SELECTORS)
 
 def auto_login(existing_context=None):
     """Automatically login using credentials from environment variables"""
-    load_dotenv()
     email = os.getenv("X_EMAIL")
     password = os.getenv("X_PASSWORD")
     
@@ -67,12 +132,13 @@ def auto_login(existing_context=None):
             browser = pw.chromium.launch(headless=True)
             context = browser.new_context(
                 viewport={"width": 1024, "height": 768},
-                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+                user_agent=LOGIN_USER_AGENT
             )
             page = context.new_page()
             should_close_page = True
         
-        # Clear any existing cookies first
+        # Clear any existing cookies first (after any in-flight write, so it can't recreate the file)
+        flush_cookie_writes()
         if os.path.exists(SESSION_FILE):
             os.remove(SESSION_FILE)
             print("Removed existing session file.")
@@ -94,15 +160,14 @@ def auto_login(existing_context=None):
                 'input[type="text"]'
             ]
             
-            for selector in email_selectors:
+            selector = wait_for_any(page, email_selectors)
+            if selector:
                 try:
-                    page.wait_for_selector(selector, timeout=5000)
                     page.fill(selector, email)
                     print(f"Email filled using selector: {selector}")
                     email_filled = True
-                    break
-                except:
-                    continue
+                except Exception as fill_error:
+                    print(f"Could not fill email field: {fill_error}")
             
             if not email_filled:
                 print("Could not find email input field")
@@ -143,15 +208,14 @@ def auto_login(existing_context=None):
                 'input[data-testid="ocfEnterTextTextInput"]'
             ]
             
-            for selector in password_selectors:
+            selector = wait_for_any(page, password_selectors)
+            if selector:
                 try:
-                    page.wait_for_selector(selector, timeout=5000)
                     page.fill(selector, password)
                     print(f"Password filled using selector: {selector}")
                     password_filled = True
-                    break
-                except:
-                    continue
+                except Exception as fill_error:
+                    print(f"Could not fill password field: {fill_error}")
             
             if not password_filled:
                 print("Could not find password input field")
@@ -190,7 +254,7 @@ def auto_login(existing_context=None):
                 print("Successfully navigated to home page.")
                 
                 # Additional verification
-                if page.query_selector("[data-testid='SideNav_AccountSwitcher_Button']") or page.query_selector("[data-testid='tweet']"):
+                if _is_logged_in_page(page):
                     print("Login verification successful!")
                     
                     # Save cookies
@@ -242,10 +306,11 @@ def handle_login():
             browser = pw.chromium.launch(headless=False)  # Always show browser for login
             context = browser.new_context(
                 viewport={"width": 1024, "height": 768},
-                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+                user_agent=LOGIN_USER_AGENT
             )
             
-            # Clear any existing cookies first
+            # Clear any existing cookies first (after any in-flight write, so it can't recreate the file)
+            flush_cookie_writes()
             if os.path.exists(SESSION_FILE):
                 os.remove(SESSION_FILE)
                 print("Removed existing session file.")
@@ -262,11 +327,11 @@ def handle_login():
                 
                 # Verify we're logged in by checking for common elements
                 try:
-                    # Try to navigate to home to ensure session is valid
-                    page.goto("https://x.com/home", timeout=15000)
+                    # X redirects to /home once logged in; wait on that instead of re-navigating
+                    page.wait_for_url(_LOGGED_IN_URL, timeout=30000)
                     
                     # Check for login indicators
-                    if page.query_selector("[data-testid='SideNav_AccountSwitcher_Button']") or page.query_selector("[data-testid='tweet']"):
+                    if _is_logged_in_page(page):
                         print("Login verification successful!")
                         
                         # Save cookies
@@ -301,302 +366,324 @@ def handle_login():
         print(f"\nError during login process: {e}")
         return False
 
-def get_db_connection():
+def _get_db_conn_params():
     """
-    Establishes a PostgreSQL database connection using environment variables from .env file.
-    Prioritizes DATABASE_URL (newsio-single format) but falls back to individual parameters.
+    Builds psycopg2 connection parameters from environment variables in the .env file.
+    Returns None if no database configuration is found.
     """
-    load_dotenv()
     
-    try:
-        # First priority: DATABASE_URL (newsio-single format)
-        database_url = os.getenv("DATABASE_URL")
+    # First priority: DATABASE_URL (newsio-single format)
+    database_url = os.getenv("DATABASE_URL")
+    
+    if database_url:
+        print("Using DATABASE_URL connection string...")
+        # Parse the DATABASE_URL
+        parsed_url = urlparse(database_url)
+        conn_params = {
+            'dbname': parsed_url.path[1:],  # Remove leading slash
+            'user': parsed_url.username,
+            'password': parsed_url.password,
+            'host': parsed_url.hostname,
+            'port': parsed_url.port or 5432
+        }
         
-        if database_url:
-            print("Using DATABASE_URL connection string...")
-            # Parse the DATABASE_URL
-            parsed_url = urlparse(database_url)
-            conn_params = {
-                'dbname': parsed_url.path[1:],  # Remove leading slash
-                'user': parsed_url.username,
-                'password': parsed_url.password,
-                'host': parsed_url.hostname,
-                'port': parsed_url.port or 5432
-            }
+        # Handle query parameters (like schema)
+        options = []
+        if parsed_url.query:
+            # Handle schema parameter if present
+            if 'schema=' in parsed_url.query:
+                schema_name = parsed_url.query.split('schema=')[-1].split('&')[0]
+                options.append(f'search_path={schema_name},public')
+        
+        # Remove IPv4 address family preference as it's not supported
+        
+        if options:
+            conn_params['options'] = f"-c {' -c '.join(options)}"
             
-            # Handle query parameters (like schema)
-            options = []
-            if parsed_url.query:
-                # Handle schema parameter if present
-                if 'schema=' in parsed_url.query:
+    else:
+        # Fallback: Individual parameters (legacy XScraper format)
+        print("DATABASE_URL not found, trying individual parameters...")
+        user = os.getenv("user")
+        password = os.getenv("password")
+        host = os.getenv("host")
+        port = os.getenv("port")
+        dbname = os.getenv("dbname")
+        
+        if not all([user, password, host, port, dbname]):
+            # Final fallback: SUPABASE_DATABASE_URL (old format)
+            supabase_url = os.getenv("SUPABASE_DATABASE_URL")
+            if supabase_url:
+                print("Using SUPABASE_DATABASE_URL as fallback...")
+                parsed_url = urlparse(supabase_url)
+                conn_params = {
+                    'dbname': parsed_url.path[1:],
+                    'user': parsed_url.username,
+                    'password': parsed_url.password,
+                    'host': parsed_url.hostname,
+                    'port': parsed_url.port or 5432
+                }
+                
+                # Handle schema if present in query
+                options = []
+                if 'schema' in parsed_url.query:
                     schema_name = parsed_url.query.split('schema=')[-1].split('&')[0]
                     options.append(f'search_path={schema_name},public')
-            
-            # Remove IPv4 address family preference as it's not supported
-            
-            if options:
-                conn_params['options'] = f"-c {' -c '.join(options)}"
                 
-        else:
-            # Fallback: Individual parameters (legacy XScraper format)
-            print("DATABASE_URL not found, trying individual parameters...")
-            user = os.getenv("user")
-            password = os.getenv("password")
-            host = os.getenv("host")
-            port = os.getenv("port")
-            dbname = os.getenv("dbname")
-            
-            if not all([user, password, host, port, dbname]):
-                # Final fallback: SUPABASE_DATABASE_URL (old format)
-                supabase_url = os.getenv("SUPABASE_DATABASE_URL")
-                if supabase_url:
-                    print("Using SUPABASE_DATABASE_URL as fallback...")
-                    parsed_url = urlparse(supabase_url)
-                    conn_params = {
-                        'dbname': parsed_url.path[1:],
-                        'user': parsed_url.username,
-                        'password': parsed_url.password,
-                        'host': parsed_url.hostname,
-                        'port': parsed_url.port or 5432
-                    }
-                    
-                    # Handle schema if present in query
-                    options = []
-                    if 'schema' in parsed_url.query:
-                        schema_name = parsed_url.query.split('schema=')[-1].split('&')[0]
-                        options.append(f'search_path={schema_name},public')
-                    
-                    # Remove IPv4 address family preference as it's not supported
-                    
-                    conn_params['options'] = f"-c {' -c '.join(options)}"
-                else:
-                    print("Error: No database connection parameters found in .env file.")
-                    print("Expected: DATABASE_URL or individual parameters (user, password, host, port, dbname)")
-                    return None
+                # Remove IPv4 address family preference as it's not supported
+                
+                conn_params['options'] = f"-c {' -c '.join(options)}"
             else:
-                # Use individual parameters
-                conn_params = {
-                    'user': user,
-                    'password': password,
-                    'host': host,
-                    'port': int(port),
-                    'dbname': dbname
-                }
-        
-        # Connect to the database
-        print(f"Connecting to database at {conn_params['host']}:{conn_params['port']}...")
-        print(f"Database name: {conn_params['dbname']}")
-        
-        conn = psycopg2.connect(**conn_params)
-        
-        # Test the connection
-        with conn.cursor() as cur:
-            cur.execute("SELECT version();")
-            version = cur.fetchone()[0]
-            print(f"Successfully connected to database: {version[:50]}...")
-            
-        return conn
-        
-    except Exception as e:
-        print(f"Error connecting to the database: {e}")
-        print("Please check your DATABASE_URL or individual database parameters in .env file")
+                print("Error: No database connection parameters found in .env file.")
+                print("Expected: DATABASE_URL or individual parameters (user, password, host, port, dbname)")
+                return None
+        else:
+            # Use individual parameters
+            conn_params = {
+                'user': user,
+                'password': password,
+                'host': host,
+                'port': int(port),
+                'dbname': dbname
+            }
+    
+    return conn_params
+
+# execute_values expands the single VALUES %s into one row per tweet
+_INSERT_TWEETS_SQL = """
+INSERT INTO public."Tweet" (id, "tweetId", text, username, "createdAt", analyzed, analysis, "contentFingerprint")
+VALUES %s
+ON CONFLICT ("tweetId") DO NOTHING
+RETURNING "tweetId";
+"""
+
+def _tweet_db_row(tweet_data):
+    """Builds the INSERT parameters for a tweet, or returns None if it is missing required data."""
+    # Validate required tweet data
+    if not tweet_data.get('id'):
+        print("Tweet missing ID, skipping DB save.")
+        return None
+    
+    if not tweet_data.get('text'):
+        print(f"Tweet {tweet_data.get('id')} missing text, skipping DB save.")
         return None
 
-def close_db_connection_safely(conn):
-    """Safely close a database connection."""
-    if conn:
+    # Print the raw tweet data for debugging (formatting the user dict for every row isn't free)
+    if DEBUG_LOG:
+        print(f"Tweet data for DB save (ID: {tweet_data['id']}):")
+        print(f"  - Text: {tweet_data['text'][:50]}...")
+        print(f"  - Raw user data: {tweet_data.get('user', {})}")
+
+    # Extract username directly - Twitter API sometimes nests it differently
+    username = None
+    if 'user' in tweet_data:
+        username = tweet_data['user'].get('username')
+        if not username or username == "Unknown":
+            # Try alternative paths in case API structure changed
+            if 'user' in tweet_data and 'screen_name' in tweet_data['user']:
+                username = tweet_data['user']['screen_name']
+            elif 'screen_name' in tweet_data:
+                username = tweet_data['screen_name']
+
+    # Debug output for username
+    if not username:
+        print(f"WARNING: Username not found for tweet {tweet_data['id']}")
+        print(f"User data: {tweet_data.get('user', {})}")
+    elif DEBUG_LOG:
+        print(f"Found username for DB: {username}")
+
+    # Handle date parsing with fallback
+    created_at_dt = None
+    created_at_str = tweet_data.get('created_at')
+    
+    if created_at_str:
         try:
-            if not conn.closed:
-                conn.close()
-                print("Database connection closed successfully.")
-            else:
-                print("Database connection was already closed.")
-        except Exception as e:
-            print(f"Error closing database connection: {e}")
+            # Parse Twitter's date format (e.g., "Wed May 07 00:08:42 +0000 2025")
+            created_at_dt = datetime.datetime.strptime(created_at_str, '%a %b %d %H:%M:%S %z %Y')
+        except ValueError as ve:
+            print(f"Error parsing date '{created_at_str}' for tweet {tweet_data['id']}: {ve}")
+            # Use current time as fallback
+            created_at_dt = datetime.datetime.now(datetime.timezone.utc)
     else:
-        print("No database connection to close.")
-
-def check_db_connection_status(conn):
-    """Check the status of a database connection and attempt basic connectivity test."""
-    if not conn:
-        print("Database connection is None")
-        return False
+        print(f"Tweet {tweet_data['id']} missing created_at, using current time")
+        created_at_dt = datetime.datetime.now(datetime.timezone.utc)
     
-    try:
-        if conn.closed:
-            print(f"Database connection is closed (status: {conn.closed})")
-            return False
-        else:
-            # Test the connection with a simple query
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1;")
-                result = cur.fetchone()
-                if result and result[0] == 1:
-                    print("Database connection is healthy")
-                    return True
-                else:
-                    print("Database connection test failed")
-                    return False
-    except Exception as e:
-        print(f"Database connection check failed: {e}")
-        return False
+    # Generate a unique ID for the tweet - using a UUID which is compatible with CUID format
+    tweet_id = str(uuid.uuid4())
+    
+    return (
+        tweet_id,           # Add the generated UUID as the primary key
+        tweet_data['id'],
+        tweet_data['text'],
+        username,           # Use the directly extracted username
+        created_at_dt,      # Use the datetime object
+        False,              # analyzed (default)
+        None,               # analysis (JSONB, so None for null)
+        None                # contentFingerprint (optional)
+    )
 
-def save_tweet_to_db(tweet_data, conn):
-    """Saves a single tweet's metadata to the PostgreSQL database."""
-    if not conn:
-        print("Database connection not available. Skipping DB save.")
-        return False, conn
+# Shared pool: connections are reused across saves and cycles instead of reconnecting
+DB_POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX_CONN", "5"))
+_DB_POOL = None
 
-    try:
-        # Check if connection is closed
-        if conn.closed:
-            print("Database connection was closed. Attempting to reconnect...")
-            old_conn = conn  # Keep reference to old connection for cleanup
-            conn = get_db_connection()
-            if not conn:
-                print("Failed to reconnect to database. Skipping DB save.")
-                # Clean up the old closed connection
-                try:
-                    if old_conn and not old_conn.closed:
-                        old_conn.close()
-                except Exception:
-                    pass
-                return False, None
-            # Clean up the old closed connection
-            try:
-                if old_conn and not old_conn.closed:
-                    old_conn.close()
-            except Exception:
-                pass
+def get_db_pool():
+    """Lazily creates the shared connection pool. Returns None if the database isn't configured or reachable."""
+    global _DB_POOL
+    if _DB_POOL is None or _DB_POOL.closed:
+        try:
+            conn_params = _get_db_conn_params()
+            if not conn_params:
+                return None
+            _DB_POOL = ThreadedConnectionPool(1, DB_POOL_MAX_CONN, **conn_params)
+            print(f"Database connection pool ready (max {DB_POOL_MAX_CONN} connections).")
+        except Exception as e:
+            print(f"Error creating database connection pool: {e}")
+            _DB_POOL = None
+    return _DB_POOL
 
-        # Validate required tweet data
-        if not tweet_data.get('id'):
-            print("Tweet missing ID, skipping DB save.")
-            return False, conn
-        
-        if not tweet_data.get('text'):
-            print(f"Tweet {tweet_data.get('id')} missing text, skipping DB save.")
-            return False, conn
+def close_db_pool():
+    """Close every connection in the shared pool."""
+    global _DB_POOL
+    if _DB_POOL and not _DB_POOL.closed:
+        try:
+            _DB_POOL.closeall()
+            print("Database connection pool closed.")
+        except Exception as e:
+            print(f"Error closing database connection pool: {e}")
+    _DB_POOL = None
 
-        # Print the raw tweet data for debugging
-        print(f"Tweet data for DB save (ID: {tweet_data['id']}):")
-        print(f"  - Text: {tweet_data['text'][:50]}...")
-        print(f"  - Raw user data: {tweet_data.get('user', {})}")
+def save_tweets_bulk(tweets, db_pool, page_size=100):
+    """Saves a batch of tweets with one multi-row INSERT per page on a connection borrowed from db_pool.
 
-        # Extract username directly - Twitter API sometimes nests it differently
-        username = None
-        if 'user' in tweet_data:
-            username = tweet_data['user'].get('username')
-            if not username or username == "Unknown":
-                # Try alternative paths in case API structure changed
-                if 'user' in tweet_data and 'screen_name' in tweet_data['user']:
-                    username = tweet_data['user']['screen_name']
-                elif 'screen_name' in tweet_data:
-                    username = tweet_data['screen_name']
-
-        # Debug output for username
-        if not username:
-            print(f"WARNING: Username not found for tweet {tweet_data['id']}")
-            print(f"User data: {tweet_data.get('user', {})}")
-        else:
-            print(f"Found username for DB: {username}")
+    Returns the number of tweets actually inserted (ones already in the table are skipped),
+    or None if the save failed.
+    """
+    rows = [row for row in (_tweet_db_row(tweet_data) for tweet_data in tweets) if row is not None]
+    if not rows:
+        return 0
 
-        with conn.cursor() as cur:
-            # Handle date parsing with fallback
-            created_at_dt = None
-            created_at_str = tweet_data.get('created_at')
-            
-            if created_at_str:
-                try:
-                    # Parse Twitter's date format (e.g., "Wed May 07 00:08:42 +0000 2025")
-                    created_at_dt = datetime.datetime.strptime(created_at_str, '%a %b %d %H:%M:%S %z %Y')
-                except ValueError as ve:
-                    print(f"Error parsing date '{created_at_str}' for tweet {tweet_data['id']}: {ve}")
-                    # Use current time as fallback
-                    created_at_dt = datetime.datetime.now(datetime.timezone.utc)
-            else:
-                print(f"Tweet {tweet_data['id']} missing created_at, using current time")
-                created_at_dt = datetime.datetime.now(datetime.timezone.utc)
-            
-            # Generate a unique ID for the tweet - using a UUID which is compatible with CUID format
-            tweet_id = str(uuid.uuid4())
-            
-            sql = """
-            INSERT INTO public."Tweet" (id, "tweetId", text, username, "createdAt", analyzed, analysis, "contentFingerprint")
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT ("tweetId") DO NOTHING;
-            """
-            
-            print(f"Executing SQL with username: {username}")
-            
-            cur.execute(sql, (
-                tweet_id,           # Add the generated UUID as the primary key
-                tweet_data['id'],
-                tweet_data['text'],
-                username,           # Use the directly extracted username
-                created_at_dt,      # Use the datetime object
-                False,              # analyzed (default)
-                None,               # analysis (JSONB, so None for null)
-                None                # contentFingerprint (optional)
-            ))
+    # A second attempt only happens when the server dropped the first connection
+    for attempt in range(2):
+        try:
+            conn = db_pool.getconn()
+        except Exception as e:
+            print(f"Could not get a database connection: {e}")
+            return None
+        discard = False
+        try:
+            with conn.cursor() as cur:
+                inserted = execute_values(cur, _INSERT_TWEETS_SQL, rows, page_size=page_size, fetch=True)
             conn.commit()
-            print(f"Successfully saved tweet {tweet_data['id']} to database with username: {username}")
-            return True, conn
-    except Exception as e:
-        print(f"Error saving tweet {tweet_data.get('id')} to DB: {e}")
-        # Check if the connection was closed by the server
-        if "server closed the connection" in str(e) or (conn and conn.closed):
-            print("Connection lost. Attempting to reconnect...")
-            try:
-                old_conn = conn
-                # Close the failed connection if it's not already closed
-                if old_conn and not old_conn.closed:
-                    old_conn.close()
-                # Get a new connection
-                conn = get_db_connection()
-                if conn:
-                    print("Successfully reconnected to database.")
-                    # Try again with new connection (but limit recursion)
-                    return save_tweet_to_db(tweet_data, conn)
-                else:
-                    print("Failed to reconnect to database.")
-                    return False, None
-            except Exception as reconnect_error:
-                print(f"Error during reconnection: {reconnect_error}")
-                return False, None
-        else:
-            # For other errors, just rollback
+            return len(inserted)
+        except psycopg2.OperationalError as e:
+            print(f"Connection lost while saving tweets: {e}")
+            discard = True
+        except Exception as e:
+            print(f"Error saving tweets to DB: {e}")
             try:
-                if conn:
-                    conn.rollback()
+                conn.rollback()
             except Exception:
                 # If rollback fails, the connection is probably dead
-                pass
-        return False, conn
+                discard = True
+                return None
+            # One bad row fails the whole INSERT; save the rest one by one so they aren't lost with it
+            print("Retrying the batch one tweet at a time...")
+            return _save_rows_individually(conn, rows)
+        finally:
+            db_pool.putconn(conn, close=discard or bool(conn.closed))
+    return None
+
+def _save_rows_individually(conn, rows):
+    """Inserts rows one per transaction, skipping any the database rejects.
+
+    Returns the number inserted, or None if the connection was lost partway.
+    """
+    inserted = 0
+    for row in rows:
+        try:
+            with conn.cursor() as cur:
+                inserted += len(execute_values(cur, _INSERT_TWEETS_SQL, [row], fetch=True))
+            conn.commit()
+        except psycopg2.OperationalError as e:
+            print(f"Connection lost while saving tweets: {e}")
+            return None
+        except Exception as e:
+            print(f"Error saving tweet {row[1]} to DB: {e}")
+            try:
+                conn.rollback()
+            except Exception:
+                return None
+    return inserted
+
+def _write_json_atomic(path, data, option=orjson.OPT_INDENT_2):
+    """Serialize with orjson to a temp file and rename it over path, so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(data, option=option))
+    os.replace(tmp_path, path)
+
+# Parsed session cookies keyed on the session file's mtime, so reloads don't re-read an unchanged file
+_COOKIE_CACHE = {"mtime": None, "cookies": None}
+# Session and tweets.json writes run here so the scraping thread isn't blocked on disk I/O
+_IO_POOL = ThreadPoolExecutor(max_workers=1)
+_pending_cookie_write = None
+
+def _write_cookies(cookies):
+    _write_json_atomic(SESSION_FILE, cookies, option=None)
+    _COOKIE_CACHE["mtime"] = os.stat(SESSION_FILE).st_mtime_ns
 
 def save_cookies(context):
+    global _pending_cookie_write
+    # context.cookies() has to run on the Playwright thread; only the file write is deferred
     cookies = context.cookies()
-    with open(SESSION_FILE, "w") as f:
-        json.dump(cookies, f)
+    _COOKIE_CACHE["cookies"] = cookies
+    _pending_cookie_write = _IO_POOL.submit(_write_cookies, cookies)
+
+def flush_cookie_writes():
+    """Wait for a pending background session write to land on disk."""
+    if _pending_cookie_write is not None:
+        try:
+            _pending_cookie_write.result()
+        except Exception as e:
+            print(f"Error saving session file: {e}")
 
 def load_cookies(context):
+    if _pending_cookie_write is not None and not _pending_cookie_write.done():
+        # Just saved and still being written: the cache already has exactly what's going to disk
+        context.add_cookies(_COOKIE_CACHE["cookies"])
+        return True
     if os.path.exists(SESSION_FILE):
-        with open(SESSION_FILE, "r") as f:
-            cookies = json.load(f)
-        context.add_cookies(cookies)
+        mtime = os.stat(SESSION_FILE).st_mtime_ns
+        if mtime != _COOKIE_CACHE["mtime"]:
+            with open(SESSION_FILE, "r") as f:
+                _COOKIE_CACHE["cookies"] = json.load(f)
+            _COOKIE_CACHE["mtime"] = mtime
+        context.add_cookies(_COOKIE_CACHE["cookies"])
         return True
     return False
 
+# Last ID known to be on disk, so an unchanged ID isn't rewritten every cycle
+_LAST_SAVED = None
+
 def save_last_tweet_id(tweet_id):
-    """Save the most recent tweet ID to file"""
-    with open(LAST_ID_FILE, "w") as f:
-        f.write(str(tweet_id)) # Ensure it's a string
+    """Save the most recent tweet ID to file (atomically, and only when it changed)"""
+    global _LAST_SAVED
+    tweet_id = str(tweet_id) # Ensure it's a string
+    if tweet_id == _LAST_SAVED:
+        return
+    tmp_path = f"{LAST_ID_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(tweet_id)
+    os.replace(tmp_path, LAST_ID_FILE)
+    _LAST_SAVED = tweet_id
 
 def load_last_tweet_id():
-    """Load the most recent tweet ID from file"""
+    """Load the most recent tweet ID from file (as an int, or None)"""
+    global _LAST_SAVED
     if os.path.exists(LAST_ID_FILE):
         with open(LAST_ID_FILE, "r") as f:
-            return f.read().strip()
+            last_id = f.read().strip()
+        _LAST_SAVED = last_id or None
+        return int(last_id) if last_id else None
     return None
 
 def extract_tweet_metadata(tweet_content):
@@ -621,6 +708,7 @@ def extract_tweet_metadata(tweet_content):
     # Extract base tweet data
     tweet_data = {
         "id": tweet_id,
+        "_id_int": int(tweet_id),  # Parsed once; used for all ID comparisons and sorting
         "created_at": legacy.get("created_at"),
         "text": tweet_text,
         "lang": legacy.get("lang"),
@@ -714,10 +802,11 @@ def extract_tweet_metadata(tweet_content):
             user_data["username"] = legacy.get("user_screen_name")
     
     # Regex fallback search for username/screen_name if still not found
+    tweet_str = None
     if user_data["username"] == "Unknown" or user_data["username"] is None:
         tweet_str = json.dumps(tweet_content)
         if "screen_name" in tweet_str:
-            screen_name_matches = re.findall(r'"screen_name":\s*"([^"]*)"', tweet_str)
+            screen_name_matches = _SCREEN_NAME_RE.findall(tweet_str)
             if screen_name_matches:
                 for match in screen_name_matches:
                     if match and match != "Unknown":
@@ -727,9 +816,10 @@ def extract_tweet_metadata(tweet_content):
     
     # Look for name field as well via regex if not found
     if user_data["name"] == "Unknown" or user_data["name"] is None:
-        tweet_str = json.dumps(tweet_content) if 'tweet_str' not in locals() else tweet_str
+        if tweet_str is None:
+            tweet_str = json.dumps(tweet_content)
         if "\"name\":" in tweet_str:
-            name_matches = re.findall(r'"name":\s*"([^"]*)"', tweet_str)
+            name_matches = _NAME_RE.findall(tweet_str)
             if name_matches:
                 for match in name_matches:
                     if match and match != "Unknown" and match != "":
@@ -802,14 +892,19 @@ def extract_tweet_metadata(tweet_content):
     
     return tweet_data
 
-def _process_xhr_calls(xhr_calls, last_tweet_id, limit, seen_ids, current_tweets_metadata_list):
-    """Helper function to process XHR calls and extract tweets."""
+def _process_xhr_calls(xhr_calls, last_tweet_id, limit, seen_ids, current_tweets_metadata_list, parsed_cache=None):
+    """Helper function to process XHR calls and extract tweets.
+
+    parsed_cache optionally maps id(xhr) to an already-parsed JSON body so it isn't decoded twice.
+    """
     newly_found_tweets_this_batch = []
     newest_id_this_batch = None
 
     for xhr in xhr_calls:
         try:
-            data = xhr.json()
+            data = parsed_cache.get(id(xhr)) if parsed_cache else None
+            if data is None:
+                data = xhr.json()
             instructions = (
                 data.get("data", {})
                 .get("list", {})
@@ -827,14 +922,15 @@ def _process_xhr_calls(xhr_calls, last_tweet_id, limit, seen_ids, current_tweets
 
                                 if tweet_id and tweet_id not in seen_ids:
                                     seen_ids.add(tweet_id)
-                                    if last_tweet_id is None or int(tweet_id) > int(last_tweet_id):
+                                    tweet_id_int = int(tweet_id)
+                                    if last_tweet_id is None or tweet_id_int > last_tweet_id:
                                         extracted_tweet = extract_tweet_metadata(tweet_content)
                                         if extracted_tweet:
                                             newly_found_tweets_this_batch.append(extracted_tweet)
                                             current_tweets_metadata_list.append(extracted_tweet)
                                         
-                                        if newest_id_this_batch is None or (tweet_id and int(tweet_id) > int(newest_id_this_batch)):
-                                            newest_id_this_batch = tweet_id
+                                        if newest_id_this_batch is None or tweet_id_int > newest_id_this_batch:
+                                            newest_id_this_batch = tweet_id_int
 
                                         if limit and len(current_tweets_metadata_list) >= limit:
                                             return newly_found_tweets_this_batch, newest_id_this_batch, True # Limit reached
@@ -861,7 +957,7 @@ def scrape_list(list_url, max_scrolls=3, wait_time=1, browser_param=None, contex
     page = None # Initialize page to None
 
     try:
-        if browser_to_use is None:
+        if context_to_use is None:
             playwright_instance_local = sync_playwright().start()
             browser_to_use = playwright_instance_local.chromium.launch(headless=True)
             context_to_use = browser_to_use.new_context(viewport={"width": 1920, "height": 1080})
@@ -884,16 +980,25 @@ def scrape_list(list_url, max_scrolls=3, wait_time=1, browser_param=None, contex
                 time.sleep(wait_time)
             else:
                 print("Initial content check after page load...")
-                time.sleep(max(wait_time, 1.5))
+                # The cells render from the timeline XHR, so it has usually landed already; only wait if not
+                if not any(_TIMELINE_TAG in xhr.url for xhr in _xhr_calls_buffer):
+                    try:
+                        page.wait_for_event("response", predicate=lambda response: _TIMELINE_TAG in response.url,
+                                            timeout=max(wait_time, 1.5) * 1000)
+                    except PlaywrightTimeoutError:
+                        pass
                 
-            # Debug XHR calls before processing
+            # Debug XHR calls before processing (only with LOG_LEVEL=DEBUG; parses are reused below)
+            parsed_xhr_cache = {}
             if _xhr_calls_buffer:
                 print(f"Found {len(_xhr_calls_buffer)} XHR calls to process")
+            if DEBUG_LOG and _xhr_calls_buffer:
                 for idx, xhr in enumerate(_xhr_calls_buffer[:3]):  # Log first 3 for debugging
                     try:
                         print(f"XHR {idx+1} URL: {xhr.url}")
-                        if "ListLatestTweetsTimeline" in xhr.url:
+                        if _TIMELINE_TAG in xhr.url:
                             xhr_data = xhr.json()
+                            parsed_xhr_cache[id(xhr)] = xhr_data
                             # Check data structure for debugging
                             data_keys = list(xhr_data.keys()) if isinstance(xhr_data, dict) else "Not a dict"
                             print(f"XHR {idx+1} data keys: {data_keys}")
@@ -907,12 +1012,15 @@ def scrape_list(list_url, max_scrolls=3, wait_time=1, browser_param=None, contex
                     except Exception as e:
                         print(f"Error examining XHR {idx+1}: {e}")
             
+            # Other "Timeline" XHRs never contain list entries; skip decoding them
+            relevant_xhr_calls = [xhr for xhr in _xhr_calls_buffer if _TIMELINE_TAG in xhr.url]
             newly_processed_this_scroll, id_this_batch, limit_hit = _process_xhr_calls(
-                _xhr_calls_buffer, last_tweet_id, limit, seen_ids, all_new_tweets_metadata
+                relevant_xhr_calls, last_tweet_id, limit, seen_ids, all_new_tweets_metadata,
+                parsed_cache=parsed_xhr_cache
             )
             _xhr_calls_buffer.clear()
 
-            if id_this_batch and (overall_newest_id is None or int(id_this_batch) > int(overall_newest_id)):
+            if id_this_batch and (overall_newest_id is None or id_this_batch > overall_newest_id):
                 overall_newest_id = id_this_batch
 
             if limit_hit:
@@ -957,62 +1065,169 @@ def scrape_list(list_url, max_scrolls=3, wait_time=1, browser_param=None, contex
         if len(all_new_tweets_metadata) > 5:
             print(f"... and {len(all_new_tweets_metadata) - 5} more tweets")
     
-    all_new_tweets_metadata.sort(key=lambda x: int(x.get("id", "0")), reverse=True)
+    all_new_tweets_metadata.sort(key=_BY_ID, reverse=True)
     if limit and len(all_new_tweets_metadata) > limit:
         all_new_tweets_metadata = all_new_tweets_metadata[:limit]
         
     return all_new_tweets_metadata, overall_newest_id
 
-def trigger_tweet_analysis():
-    """Trigger the tweet analysis API endpoint."""
-    try:
-        # Get the API base URL from environment or use default
-        load_dotenv()
-        api_base_url = os.getenv("API_BASE_URL", "http://localhost:3000")
-        api_url = f"{api_base_url}/api/twitter/analyze"
-        
-        # Make a POST request to the analysis endpoint
-        response = requests.post(api_url, timeout=10)
-        
-        # Check if the request was successful
-        if response.status_code == 200:
-            print("Successfully triggered tweet analysis API")
-            return True
-        else:
+def trigger_tweet_analysis(max_attempts=3):
+    """Trigger the tweet analysis API endpoint, retrying connection errors and 5xx with jittered backoff."""
+    # Get the API base URL from environment (.env is loaded at import) or use default
+    api_base_url = os.getenv("API_BASE_URL", "http://localhost:3000")
+    api_url = f"{api_base_url}/api/twitter/analyze"
+
+    for attempt in range(max_attempts):
+        try:
+            # Make a POST request to the analysis endpoint
+            response = requests.post(api_url, timeout=10)
+            
+            # Check if the request was successful
+            if response.status_code == 200:
+                print("Successfully triggered tweet analysis API")
+                return True
             print(f"Failed to trigger tweet analysis API. Status code: {response.status_code}")
             print(f"API URL: {api_url}")
-            return False
+            if response.status_code < 500:
+                return False
+        except Exception as e:
+            print(f"Error triggering tweet analysis API: {e}")
+        if attempt + 1 < max_attempts:
+            delay = _next_backoff(attempt)
+            print(f"Retrying tweet analysis trigger in {delay:.1f} seconds...")
+            if _stop.wait(delay):
+                return False
+    return False
+
+# Analysis is fire-and-forget: its result is only printed, so it shouldn't block the scrape loop
+_ANALYZE_POOL = ThreadPoolExecutor(max_workers=1)
+_analyze_future = None
+
+def _submit_tweet_analysis():
+    """Trigger tweet analysis in the background, skipping if the previous trigger is still in flight."""
+    global _analyze_future
+    if _analyze_future is not None and not _analyze_future.done():
+        print("Previous tweet analysis trigger still running; skipping.")
+        return
+    print("Triggering tweet analysis API...")
+    _analyze_future = _ANALYZE_POOL.submit(trigger_tweet_analysis)
+
+def _bounded_history(tweets, max_history):
+    """Build the tweets history deque: newest first, oldest entries fall off the right end."""
+    # nlargest only keeps max_history items around instead of sorting the whole input
+    return deque(nlargest(max_history, tweets, key=_BY_ID), maxlen=max_history)
+
+def _load_tweets_history(max_history):
+    """Load tweets.json into a bounded history deque (empty if the file is missing or unreadable)."""
+    tweets = []
+    if os.path.exists(TWEETS_FILE):
+        try:
+            with open(TWEETS_FILE, "rb") as f:
+                saved_data = orjson.loads(f.read())
+            if isinstance(saved_data, dict) and "tweets" in saved_data:
+                tweets = saved_data["tweets"]
+            elif isinstance(saved_data, list): # Handle old format if present
+                tweets = saved_data
+            # Older files don't carry the cached integer ID
+            for tweet in tweets:
+                tweet.setdefault("_id_int", int(tweet.get("id", 0)))
+            # Trim history if it exceeds the maximum limit
+            if len(tweets) > max_history:
+                print(f"Tweets history exceeds limit ({len(tweets)} > {max_history}). Trimming to most recent {max_history} tweets.")
+        except Exception as e:
+            print(f"Error loading existing tweets file ({TWEETS_FILE}): {e}. Starting fresh.")
+            tweets = []
+    return _bounded_history(tweets, max_history)
+
+def _persist_new_tweets(new_tweets, all_tweets, history_ids, db_pool, list_url, max_history, db_tweets=None):
+    """Merge new tweets into the history, write tweets.json, save them to the DB and trigger analysis.
+
+    db_tweets are the tweets to insert (default: new_tweets); the monitor passes its backlog of
+    tweets that earlier saves didn't get into the DB.
+
+    all_tweets is a deque from _bounded_history, kept in descending-ID order. history_ids is the
+    set of IDs in all_tweets; it is kept in sync in place so callers never need to rebuild it.
+    Returns the updated (all_tweets, saved_to_db_count); saved_to_db_count is None if the DB save failed.
+    """
+    # Merge tweets while avoiding duplicates
+    unique_new_tweets = []
+    for tweet in new_tweets:
+        if tweet["id"] not in history_ids:
+            history_ids.add(tweet["id"])
+            unique_new_tweets.append(tweet)
+    unique_new_tweets.sort(key=_BY_ID)
+
+    dropped = max(0, len(all_tweets) + len(unique_new_tweets) - max_history)
+    if not all_tweets or not unique_new_tweets or unique_new_tweets[0]["_id_int"] > all_tweets[0]["_id_int"]:
+        # Usual case: everything new is newer than the head, so push oldest-first onto the left
+        for tweet in unique_new_tweets:
+            if len(all_tweets) == max_history:
+                history_ids.discard(all_tweets[-1]["id"])
+            all_tweets.appendleft(tweet)
+    else:
+        all_tweets = _bounded_history(list(all_tweets) + unique_new_tweets, max_history)
+        history_ids.clear()
+        history_ids.update(tweet["id"] for tweet in all_tweets)
+    if dropped:
+        print(f"Trimmed tweets history to {max_history} most recent tweets.")
+
+    # Save tweets.json with meta structure, unless nothing changed and the file already exists.
+    write_future = None
+    if unique_new_tweets or not os.path.exists(TWEETS_FILE):
+        output_data_json = {
+            # _id_int is an in-memory sort key only; it is rebuilt from "id" on load
+            "tweets": [{k: v for k, v in tweet.items() if k != "_id_int"} for tweet in all_tweets],
+            "meta": {
+                "scraped_at": datetime.datetime.now().isoformat(),
+                "list_url": list_url,
+                "tweet_count": len(all_tweets)
+            }
+        }
+        # The file write and the DB insert are independent, so the write runs on the I/O thread meanwhile
+        write_future = _IO_POOL.submit(_write_json_atomic, TWEETS_FILE, output_data_json)
+
+    if db_tweets is None:
+        db_tweets = new_tweets
+    saved_to_db_count = 0
+    if db_tweets and db_pool:
+        print(f"Saving {len(db_tweets)} tweets to DB...")
+        saved_to_db_count = save_tweets_bulk(db_tweets, db_pool)
+        if saved_to_db_count is None:
+            print("Could not save tweets to the database.")
+        else:
+            print(f"Successfully saved {saved_to_db_count} new tweets to the database.")
+        # If any tweets were saved to the database, trigger the analysis API
+        if saved_to_db_count:
+            _submit_tweet_analysis()
+    elif new_tweets:
+        print(f"Found {len(new_tweets)} tweets (DB connection not available).")
+
+    if write_future is None:
+        print(f"No new tweets to add; {TWEETS_FILE} left unchanged (total: {len(all_tweets)}).")
+        return all_tweets, saved_to_db_count
+    try:
+        write_future.result()
+        print(f"Saved {len(unique_new_tweets)} new tweets (total: {len(all_tweets)}) to {TWEETS_FILE}")
     except Exception as e:
-        print(f"Error triggering tweet analysis API: {e}")
-        return False
+        print(f"Error writing tweets file ({TWEETS_FILE}): {e}")
+    return all_tweets, saved_to_db_count
 
-def monitor_list_real_time(db_conn, list_url, interval=60, max_scrolls=3, wait_time=1, headless=True, limit=None, max_consecutive_errors=5, max_history=MAX_TWEETS_HISTORY):
+def monitor_list_real_time(db_pool, list_url, interval=60, max_scrolls=3, wait_time=1, headless=True, limit=None, max_consecutive_errors=5, max_history=MAX_TWEETS_HISTORY):
     """Monitor Twitter list for new tweets with rate limiting protection."""
     last_tweet_id = load_last_tweet_id()
-    all_tweets_ever_saved_json = [] # For tweets.json cache/backup
+    all_tweets_ever_saved_json = _load_tweets_history(max_history) # For tweets.json cache/backup
+    saved_tweet_ids = {tweet["id"] for tweet in all_tweets_ever_saved_json} # Maintained by _persist_new_tweets
     consecutive_error_count = 0
+    db_attempt = 0 # Consecutive failed DB reconnects/saves; drives the jittered backoff
+    next_db_retry = 0.0 # time.monotonic() after which the DB may be tried again
+    pending_db_tweets = [] # Scraped tweets not yet in the DB; kept until a save succeeds
     base_wait_time = interval # Store the original interval for normal operation
     current_wait_time = base_wait_time # This will change during backoff
 
-    if os.path.exists(TWEETS_FILE):
-        try:
-            with open(TWEETS_FILE, "r") as f:
-                saved_data = json.load(f)
-                if isinstance(saved_data, dict) and "tweets" in saved_data:
-                    all_tweets_ever_saved_json = saved_data["tweets"]
-                elif isinstance(saved_data, list): # Handle old format if present
-                    all_tweets_ever_saved_json = saved_data
-                # Trim history if it exceeds the maximum limit
-                if len(all_tweets_ever_saved_json) > max_history:
-                    print(f"Tweets history exceeds limit ({len(all_tweets_ever_saved_json)} > {max_history}). Trimming to most recent {max_history} tweets.")
-                    all_tweets_ever_saved_json = all_tweets_ever_saved_json[:max_history]
-        except Exception as e:
-            print(f"Error loading existing tweets file ({TWEETS_FILE}): {e}. Starting fresh.")
-            all_tweets_ever_saved_json = []
-
     pw_runtime = None 
     browser_monitor = None
     context_monitor = None
+    _install_stop_handler()
     
     # Initialize browser before main loop
     pw_runtime, browser_monitor, context_monitor = initialize_browser(headless, use_proxy=True)
@@ -1046,7 +1261,7 @@ def monitor_list_real_time(db_conn, list_url, interval=60, max_scrolls=3, wait_t
             print(f"Last seen tweet ID: {last_tweet_id}")
         
         while True:
-            start_time_cycle = time.time()
+            start_time_cycle = time.monotonic()
             try:
                 print(f"\n[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Checking for new tweets...")
                 newly_scraped_tweets = []
@@ -1064,44 +1279,31 @@ def monitor_list_real_time(db_conn, list_url, interval=60, max_scrolls=3, wait_t
                 consecutive_error_count = 0
                 current_wait_time = base_wait_time
                 print(f"Successful browser request. Resuming normal interval of {current_wait_time} seconds.")
-                if newest_id_from_scrape and (last_tweet_id is None or int(newest_id_from_scrape) > int(last_tweet_id)):
+                if newest_id_from_scrape and (last_tweet_id is None or newest_id_from_scrape > last_tweet_id):
                     last_tweet_id = newest_id_from_scrape
                     save_last_tweet_id(last_tweet_id)
                 if newly_scraped_tweets:
                     print(f"Found {len(newly_scraped_tweets)} new tweets this cycle!")
-                    existing_ids_json = {tweet["id"] for tweet in all_tweets_ever_saved_json}
-                    unique_new_tweets_to_add_json = [
-                        tweet for tweet in newly_scraped_tweets if tweet["id"] not in existing_ids_json
-                    ]
-                    all_tweets_ever_saved_json = unique_new_tweets_to_add_json + all_tweets_ever_saved_json
-                    all_tweets_ever_saved_json.sort(key=lambda x: int(x.get("id", 0)), reverse=True)
-                    # Now trim to max_history if needed
-                    if len(all_tweets_ever_saved_json) > max_history:
-                        all_tweets_ever_saved_json = all_tweets_ever_saved_json[:max_history]
-                        print(f"Trimmed tweets history to {max_history} most recent tweets.")
-                    output_data_json = {
-                        "tweets": all_tweets_ever_saved_json,
-                        "meta": {
-                            "scraped_at": datetime.datetime.now().isoformat(),
-                            "list_url": list_url,
-                            "tweet_count": len(all_tweets_ever_saved_json)
-                        }
-                    }
-                    with open(TWEETS_FILE, "w") as f_json:
-                        json.dump(output_data_json, f_json, indent=2)
-                    saved_to_db_count = 0
-                    if db_conn:
-                        print(f"Saving {len(newly_scraped_tweets)} tweets to DB...")
-                        for tweet_data in newly_scraped_tweets:
-                            success, db_conn = save_tweet_to_db(tweet_data, db_conn)
-                            if success:
-                                saved_to_db_count += 1
-                        print(f"Successfully saved {saved_to_db_count} new tweets to the database.")
-                        if saved_to_db_count > 0:
-                            print("Triggering tweet analysis API...")
-                            trigger_tweet_analysis()
-                    else:
-                        print(f"Found {len(newly_scraped_tweets)} tweets (DB connection not available).")
+                    # last_tweet_id has already moved past these, so hold them until they reach the DB
+                    pending_db_tweets.extend(newly_scraped_tweets)
+                    del pending_db_tweets[:-max_history]
+                    # Reconnect a lost/unavailable DB; failed reconnects and failed saves both back off with jitter
+                    db_due = time.monotonic() >= next_db_retry
+                    if not db_pool and db_due:
+                        db_pool = get_db_pool()
+                    all_tweets_ever_saved_json, saved_to_db_count = _persist_new_tweets(
+                        newly_scraped_tweets, all_tweets_ever_saved_json, saved_tweet_ids,
+                        db_pool if db_due else None, list_url, max_history, db_tweets=pending_db_tweets
+                    )
+                    if db_due:
+                        if db_pool and saved_to_db_count is not None:
+                            db_attempt = 0
+                            pending_db_tweets.clear()
+                        else:
+                            retry_in = _next_backoff(db_attempt)
+                            db_attempt = min(db_attempt + 1, 6)
+                            next_db_retry = time.monotonic() + retry_in
+                            print(f"Database unavailable; {len(pending_db_tweets)} tweets kept for the next attempt in {retry_in:.1f} seconds.")
                     for tweet in newly_scraped_tweets: 
                         username = tweet.get("user", {}).get("username", "Unknown")
                         text = tweet.get("text", "").replace("\n", " ")
@@ -1112,14 +1314,22 @@ def monitor_list_real_time(db_conn, list_url, interval=60, max_scrolls=3, wait_t
                 print(f"Page load/scrape error during cycle: {ple}")
                 consecutive_error_count += 1
                 current_wait_time = min(1800, base_wait_time * (2 ** consecutive_error_count))
-                print(f"Possible rate limiting detected. Implementing backoff: {current_wait_time} seconds.")
-                if consecutive_error_count >= 3:
-                    print("Multiple consecutive errors. Reinitializing browser and rotating proxy...")
+                # A crashed/disconnected browser looks like a page load failure; don't mistake it for rate limiting
+                browser_alive = _browser_is_alive(context_monitor)
+                if browser_alive:
+                    print(f"Possible rate limiting detected. Implementing backoff: {current_wait_time} seconds.")
+                if consecutive_error_count >= 3 or not browser_alive:
+                    if browser_alive:
+                        print("Multiple consecutive errors. Reinitializing browser and rotating proxy...")
+                    else:
+                        print("Browser is not responding. Reinitializing browser and rotating proxy...")
                     try:
                         if browser_monitor: browser_monitor.close()
                         if pw_runtime: pw_runtime.stop()
                     except Exception as e_cleanup: print(f"Error during browser cleanup: {e_cleanup}")
-                    time.sleep(5)
+                    if _stop.wait(5):
+                        print("\nMonitoring stopped by signal. Cleaning up resources...")
+                        return
                     pw_runtime, browser_monitor, context_monitor = initialize_browser(headless, use_proxy=True)
                     if load_cookies(context_monitor):
                         session_available = True
@@ -1146,28 +1356,23 @@ def monitor_list_real_time(db_conn, list_url, interval=60, max_scrolls=3, wait_t
                 else:
                     print(f"Consecutive errors: {consecutive_error_count}/{max_consecutive_errors}. Will wait {current_wait_time} seconds.")
             # Wait for next cycle
-            elapsed_cycle = time.time() - start_time_cycle
+            elapsed_cycle = time.monotonic() - start_time_cycle
             actual_wait_time = max(1, current_wait_time - elapsed_cycle)
             print(f"Waiting {int(actual_wait_time)} seconds before next check...")
-            time.sleep(actual_wait_time)
+            if _wait_for_next_cycle(actual_wait_time):
+                print("\nMonitoring stopped by signal. Cleaning up resources...")
+                return
     except KeyboardInterrupt:
         print("\nMonitoring stopped by user. Cleaning up resources...")
     except Exception as e_monitor: # Catches errors from setup
         print(f"Fatal error in monitor setup: {e_monitor}. Exiting.")
     finally:
-        if db_conn:
-            try:
-                close_db_connection_safely(db_conn)
-            except Exception as e_db_close:
-                print(f"Error closing database connection: {e_db_close}")
+        close_db_pool()
+        flush_cookie_writes()
         if browser_monitor:
             try:
                 print("Shutting down browser...")
-                for page in browser_monitor.contexts[0].pages:
-                    try:
-                        page.close(timeout=1000) 
-                    except Exception:
-                        pass 
+                # browser.close() tears down every context and page in one call; closing pages first only added latency
                 browser_monitor.close()
                 print("Browser closed.")
             except Exception as e_close_browser_mon:
@@ -1181,41 +1386,67 @@ def monitor_list_real_time(db_conn, list_url, interval=60, max_scrolls=3, wait_t
                 print(f"Non-fatal error stopping Playwright: {e_stop_pw_mon}")
         print("Monitoring ended.")
 
-def initialize_browser(headless=True, use_proxy=True):
-    """Initialize a browser with a random user agent and return the components. Optionally use Decodo proxy."""
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+]
+# OS entropy, so restarts that land on the same clock second don't keep picking the same UA
+_UA_RNG = random.SystemRandom()
+
+def _browser_is_alive(context, timeout=2):
+    """Cheap liveness probe: one JS round-trip over the existing CDP connection, no navigation."""
+    page = None
+    try:
+        page = context.new_page()
+        page.wait_for_function("() => true", timeout=timeout * 1000)
+        return True
+    except Exception:
+        return False
+    finally:
+        if page:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+def initialize_browser(headless=True, use_proxy=True, pw_runtime=None, user_data_dir=None):
+    """Initialize a browser with a random user agent and return the components. Optionally use Decodo proxy.
+
+    Pass pw_runtime to reuse an already started Playwright, and user_data_dir to launch a persistent
+    context instead (browser is then None; close the context to shut it down).
+    """
     print("Initializing Playwright and browser...")
-    pw_runtime = sync_playwright().start()
+    if pw_runtime is None:
+        pw_runtime = sync_playwright().start()
     
     # Create browser with custom user agent to reduce detection
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    selected_user_agent = _UA_RNG.choice(USER_AGENTS)
+    launch_args = [
+        '--disable-blink-features=AutomationControlled',
+        # Chromium only honours the last --disable-features, so keep them in one flag
+        '--disable-features=IsolateOrigins,site-per-process,Translate,BackForwardCache',
+        '--disable-dev-shm-usage',  # Docker's small /dev/shm otherwise crashes tabs
     ]
-    selected_user_agent = user_agents[int(time.time()) % len(user_agents)]
-
-    browser = pw_runtime.chromium.launch(
-        headless=headless,
-        args=[
-            '--disable-blink-features=AutomationControlled',
-            '--disable-features=IsolateOrigins,site-per-process',
-        ]
-    )
+    context_options = {
+        "viewport": {"width": 1920, "height": 1080},
+        "user_agent": selected_user_agent,
+    }
 
     proxy_config = get_random_proxy_config() if use_proxy else None
     if proxy_config:
         print(f"Using Decodo proxy: {proxy_config['server']}")
-        context = browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent=selected_user_agent,
-            proxy=proxy_config
+        context_options["proxy"] = proxy_config
+
+    if user_data_dir:
+        browser = None
+        context = pw_runtime.chromium.launch_persistent_context(
+            user_data_dir, headless=headless, args=launch_args, **context_options
         )
     else:
-        context = browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent=selected_user_agent
-        )
+        browser = pw_runtime.chromium.launch(headless=headless, args=launch_args)
+        context = browser.new_context(**context_options)
 
     context.add_init_script("""
         Object.defineProperty(navigator, 'webdriver', {
@@ -1270,20 +1501,23 @@ if __name__ == "__main__":
             print("Login process didn't complete successfully. Exiting.")
             sys.exit(1)
     
-    db_connection = get_db_connection()
-    if not db_connection and not args.once: # If DB fails and it's not --once, maybe warn or exit if DB is critical
-        print("Warning: Could not connect to database. Monitoring will proceed without DB saving.")
+    db_pool = get_db_pool()
+    if not db_pool and not args.once: # If DB fails and it's not --once, maybe warn or exit if DB is critical
+        print("Warning: Could not connect to database. Monitoring will proceed and retry the DB when new tweets arrive.")
         # If DB is absolutely critical for monitoring, you might choose to exit here:
         # print("Critical: Database connection failed. Exiting monitor.")
         # exit(1)
-    elif not db_connection and args.once:
+    elif not db_pool and args.once:
         print("Warning: Could not connect to database. --once mode will run without DB saving.")
 
     if args.once:
         # For --once, we manage playwright and browser instance within this block
         with sync_playwright() as pw_once:
-            browser_once = pw_once.chromium.launch(headless=not args.visible)
-            context_once = browser_once.new_context(viewport={"width": 1920, "height": 1080})
+            # Same stealth setup as the monitor; a persistent profile keeps cookies and the HTTP cache between runs
+            _, _, context_once = initialize_browser(
+                headless=not args.visible, use_proxy=False, pw_runtime=pw_once, user_data_dir=PW_PROFILE_DIR
+            )
+            # x_session.json stays the source of truth (a fresh --login rewrites it), so always seed the profile from it
             if not load_cookies(context_once):
                 print("Login required for --once mode. Please run with --login first or allow login now.")
                 temp_page_once = context_once.new_page()
@@ -1304,77 +1538,31 @@ if __name__ == "__main__":
                     args.url, 
                     max_scrolls=args.scrolls, 
                     wait_time=args.wait,
-                    browser_param=browser_once,
                     context_param=context_once,
                     last_tweet_id=last_id_for_once_run,
                     limit=run_limit
                 )
                 
                 # In --once mode, we should update the last_tweet_id if new tweets were found
-                if newest_id_for_once and (last_id_for_once_run is None or int(newest_id_for_once) > int(last_id_for_once_run)):
+                if newest_id_for_once and (last_id_for_once_run is None or newest_id_for_once > last_id_for_once_run):
                     save_last_tweet_id(newest_id_for_once)
 
                 # Load any existing tweets for proper merging
-                all_tweets_history = []
-                if os.path.exists(TWEETS_FILE):
-                    try:
-                        with open(TWEETS_FILE, "r") as f:
-                            saved_data = json.load(f)
-                            if isinstance(saved_data, dict) and "tweets" in saved_data:
-                                all_tweets_history = saved_data["tweets"]
-                            elif isinstance(saved_data, list):
-                                all_tweets_history = saved_data
-                    except Exception as e:
-                        print(f"Error loading existing tweets: {e}")
+                all_tweets_history = _load_tweets_history(max_history)
                 
-                # Merge tweets while avoiding duplicates
-                existing_ids = {tweet["id"] for tweet in all_tweets_history}
-                unique_new_tweets = [tweet for tweet in tweets_scraped_once if tweet["id"] not in existing_ids]
-                all_tweets_history = unique_new_tweets + all_tweets_history
-                
-                # Sort and trim
-                all_tweets_history.sort(key=lambda x: int(x.get("id", 0)), reverse=True)
-                if len(all_tweets_history) > max_history:
-                    all_tweets_history = all_tweets_history[:max_history]
-                    print(f"Trimmed tweets history to {max_history} most recent tweets.")
-
-                # Save tweets.json with meta structure.
-                output_data_once_json = {
-                    "tweets": all_tweets_history,
-                    "meta": {
-                        "scraped_at": datetime.datetime.now().isoformat(),
-                        "list_url": args.url,
-                        "tweet_count": len(all_tweets_history)
-                    }
-                }
-                with open(TWEETS_FILE, "w") as f_json_once:
-                    json.dump(output_data_once_json, f_json_once, indent=2)
-                
-                print(f"Saved {len(tweets_scraped_once)} new tweets (total: {len(all_tweets_history)}) to {TWEETS_FILE}")
-                
-                # Add saving to database in --once mode
-                saved_to_db_count = 0
-                if db_connection and tweets_scraped_once:
-                    print(f"Saving {len(tweets_scraped_once)} tweets to database...")
-                    for tweet_data in tweets_scraped_once:
-                        success, db_connection = save_tweet_to_db(tweet_data, db_connection)
-                        if success:
-                            saved_to_db_count += 1
-                    print(f"Successfully saved {saved_to_db_count} tweets to database.")
-                    
-                    # If any tweets were saved to the database, trigger the analysis API
-                    if saved_to_db_count > 0:
-                        print("Triggering tweet analysis API...")
-                        trigger_tweet_analysis()
+                all_tweets_history, _ = _persist_new_tweets(
+                    tweets_scraped_once, all_tweets_history,
+                    {tweet["id"] for tweet in all_tweets_history}, db_pool, args.url, max_history
+                )
                 
             finally:
                 # Always clean up database connection in --once mode
-                close_db_connection_safely(db_connection)
+                close_db_pool()
+                flush_cookie_writes()
             
-            browser_once.close()
-            pw_once.stop()
+            context_once.close()
     else:
         monitor_list_real_time(
-            db_connection, args.url, args.interval, args.scrolls, 
+            db_pool, args.url, args.interval, args.scrolls, 
             args.wait, not args.visible, run_limit, args.max_errors, max_history
         )
\ No newline at end of file
@@ -6,10 +6,12 @@ Helper script to set up backup account credentials and test the multi-account se
 import os
 from dotenv import load_dotenv, set_key
 import getpass
+import importlib.util
+
+load_dotenv()
 
 def setup_backup_credentials():
     """Interactive setup for backup account credentials"""
-    load_dotenv()
     
     print("🔧 Multi-Account Twitter Scraper Setup")
     print("=" * 40)
@@ -63,6 +65,11 @@ def test_setup():
     """Test the multi-account setup"""
     print("\n🧪 Testing multi-account setup...")
     
+    # Check the module is there before paying for its (Playwright) import
+    if importlib.util.find_spec("multi_account_scraper") is None:
+        print("❌ multi_account_scraper.py not found")
+        return False
+    
     try:
         from multi_account_scraper import MultiAccountScraper
         
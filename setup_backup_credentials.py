@@ -7,14 +7,13 @@ import os
 import getpass
 from dotenv import load_dotenv, set_key
 
+load_dotenv()
+
 def setup_backup_credentials():
     """Interactive setup for backup account credentials"""
     print("🔧 Backup Account Credentials Setup")
     print("=" * 40)
     
-    # Load existing environment
-    load_dotenv()
-    
     # Check current status
     primary_email = os.getenv("X_EMAIL")
     backup_email = os.getenv("X_EMAIL_BACKUP")
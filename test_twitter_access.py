@@ -1,45 +1,62 @@
 #!/usr/bin/env python3
 import requests
-import subprocess
-import json
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared keep-alive session, so repeat requests to x.com skip the TCP/TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+FAST_TIMEOUT_S = 5   # Plain-text IP lookup
+SLOW_TIMEOUT_S = 10  # x.com pages
+
+def _fetch(url, timeout=SLOW_TIMEOUT_S):
+    """GET url, returning (response, None) or (None, error)"""
+    try:
+        return _SESSION.get(url, timeout=timeout), None
+    except Exception as e:
+        return None, e
 
 def test_twitter_access():
     print("=== TWITTER ACCESSIBILITY TEST ===\n")
     
+    # The IP lookup and both probes are independent, so run them concurrently and report in order
+    list_url = "https://x.com/i/lists/1919380958723158457"
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        ip_result, home_result, list_result = ex.map(
+            _fetch, ['https://ipinfo.io/ip', 'https://x.com/', list_url], [FAST_TIMEOUT_S, SLOW_TIMEOUT_S, SLOW_TIMEOUT_S]
+        )
+    
     # Get current IP
-    try:
-        ip_result = subprocess.run(['curl', '-s', 'https://ipinfo.io/ip'], 
-                                 capture_output=True, text=True)
-        current_ip = ip_result.stdout.strip()
+    response, error = ip_result
+    current_ip = response.text.strip() if response is not None else "unknown"
+    if response is not None:
         print(f"🌐 Current IP: {current_ip}")
-    except:
-        current_ip = "unknown"
     
     # Test Twitter main page
     print("\n📋 Testing Twitter access...")
-    try:
-        response = requests.get('https://x.com/', timeout=10)
+    response, error = home_result
+    if response is not None:
         print(f"✅ x.com - Status: {response.status_code}")
         if response.status_code == 403:
             print("   🚨 IP appears to be blocked!")
         elif response.status_code == 200:
             print("   ✅ IP can access Twitter")
-    except Exception as e:
-        print(f"❌ x.com - Error: {e}")
+    else:
+        print(f"❌ x.com - Error: {error}")
     
     # Test specific list
     print("\n📋 Testing specific list...")
-    list_url = "https://x.com/i/lists/1919380958723158457"
-    try:
-        response = requests.get(list_url, timeout=10)
+    response, error = list_result
+    if response is not None:
         print(f"✅ List URL - Status: {response.status_code}")
         if response.status_code == 403:
             print("   🚨 List access blocked!")
         elif response.status_code == 200:
             print("   ✅ List accessible")
             print(f"   📄 Content length: {len(response.content)} bytes")
-    except Exception as e:
-        print(f"❌ List URL - Error: {e}")
+    else:
+        print(f"❌ List URL - Error: {error}")
 
 if __name__ == "__main__":
     test_twitter_access()
@@ -1,56 +1,59 @@
 #!/usr/bin/env python3
 
+REPORT_TEMPLATE = """=== TWITTER SCRAPING TRAFFIC CALCULATION ===
+
+📊 TYPICAL DATA SIZES:
+   Twitter list page: ~{twitter_page_size} MB
+   API response (20 tweets): ~{tweet_api_response} MB
+   Media/images per page: ~{images_media} MB
+
+🔄 YOUR SCRAPING PATTERN:
+   Realistic successful checks/hour: {realistic_successful_checks}
+   Hours per day: {hours_per_day}
+
+📈 DAILY USAGE:
+   Page loads per day: {daily_page_loads}
+   Daily traffic: {daily_traffic_gb:.2f} GB
+
+📅 MONTHLY USAGE:
+   Monthly traffic: {monthly_traffic_gb:.1f} GB
+
+🎯 50GB PACKAGE ANALYSIS:
+   50GB would last: {days_covered:.1f} days
+{package_verdict}
+
+📋 DIFFERENT SCENARIOS:
+{scenario_lines}"""
+
 def calculate_twitter_scraping_traffic():
-    print("=== TWITTER SCRAPING TRAFFIC CALCULATION ===\n")
-    
     # Typical data sizes for Twitter scraping
     twitter_page_size = 2.5  # MB (average Twitter list page with tweets)
     tweet_api_response = 0.1  # MB (typical API response with 20 tweets)
     images_media = 0.5  # MB (if downloading tweet images/media)
     
-    print("📊 TYPICAL DATA SIZES:")
-    print(f"   Twitter list page: ~{twitter_page_size} MB")
-    print(f"   API response (20 tweets): ~{tweet_api_response} MB") 
-    print(f"   Media/images per page: ~{images_media} MB")
-    
     # Your current scraping pattern
     checks_per_hour = 30  # Every 2 seconds = 1800 checks/hour, but limited by rate limits
     realistic_successful_checks = 10  # After rate limiting
     hours_per_day = 24
     
-    print(f"\n🔄 YOUR SCRAPING PATTERN:")
-    print(f"   Realistic successful checks/hour: {realistic_successful_checks}")
-    print(f"   Hours per day: {hours_per_day}")
-    
     # Daily traffic calculation
     daily_page_loads = realistic_successful_checks * hours_per_day
     daily_traffic_mb = daily_page_loads * twitter_page_size
     daily_traffic_gb = daily_traffic_mb / 1024
     
-    print(f"\n📈 DAILY USAGE:")
-    print(f"   Page loads per day: {daily_page_loads}")
-    print(f"   Daily traffic: {daily_traffic_gb:.2f} GB")
-    
     # Monthly calculation
     monthly_traffic_gb = daily_traffic_gb * 30
-    print(f"\n📅 MONTHLY USAGE:")
-    print(f"   Monthly traffic: {monthly_traffic_gb:.1f} GB")
     
     # 50GB analysis
-    print(f"\n🎯 50GB PACKAGE ANALYSIS:")
     days_covered = 50 / daily_traffic_gb
-    print(f"   50GB would last: {days_covered:.1f} days")
-    
     if monthly_traffic_gb <= 50:
-        print(f"   ✅ 50GB is MORE than enough!")
-        print(f"   📊 You'd use ~{(monthly_traffic_gb/50)*100:.1f}% of the package")
+        package_verdict = (f"   ✅ 50GB is MORE than enough!\n"
+                           f"   📊 You'd use ~{(monthly_traffic_gb/50)*100:.1f}% of the package")
     else:
-        print(f"   ❌ 50GB is NOT enough")
-        print(f"   📊 You'd need ~{monthly_traffic_gb:.1f}GB/month")
+        package_verdict = (f"   ❌ 50GB is NOT enough\n"
+                           f"   📊 You'd need ~{monthly_traffic_gb:.1f}GB/month")
     
     # Scenarios
-    print(f"\n📋 DIFFERENT SCENARIOS:")
-    
     scenarios = [
         ("Light usage (5 checks/hour)", 5),
         ("Current usage (10 checks/hour)", 10), 
@@ -58,10 +61,12 @@ def calculate_twitter_scraping_traffic():
         ("Aggressive (50 checks/hour)", 50)
     ]
     
-    for name, checks in scenarios:
-        daily_gb = (checks * 24 * twitter_page_size) / 1024
-        monthly_gb = daily_gb * 30
-        print(f"   {name}: {monthly_gb:.1f} GB/month")
+    # Monthly GB scales linearly with checks/hour, so work out the per-check figure once
+    monthly_gb_per_check = (hours_per_day * twitter_page_size * 30) / 1024
+    scenario_lines = "\n".join(f"   {name}: {checks * monthly_gb_per_check:.1f} GB/month" for name, checks in scenarios)
+    
+    # Format the whole report at once
+    print(REPORT_TEMPLATE.format_map(locals()))
 
 if __name__ == "__main__":
     calculate_twitter_scraping_traffic()
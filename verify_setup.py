@@ -2,21 +2,32 @@
 """
 Quick verification script to check if XScraper is properly configured with Decodo proxy
 """
+import io
 import os
 import sys
+from contextlib import redirect_stdout
 from dotenv import load_dotenv
 
+# Each issue reported in the summary, with the variables that must all be set to clear it
+REQUIRED_CONFIG = [
+    ("Database configuration", ("DATABASE_URL",)),
+    ("Primary account credentials", ("X_EMAIL", "X_PASSWORD")),
+    ("Backup account credentials", ("X_EMAIL_BACKUP", "X_PASSWORD_BACKUP")),
+    ("Decodo proxy configuration", ("DECODO_USERNAME", "DECODO_PASSWORD", "DECODO_HOST", "DECODO_PORTS")),
+]
+
 def verify_setup():
     """Verify that XScraper is properly configured"""
     print("🔍 XScraper Setup Verification")
     print("=" * 40)
     
-    # Load environment variables
+    # Load environment variables and read them from one snapshot
     load_dotenv()
+    env = dict(os.environ)
     
     # Check database configuration
     print("\n📊 Database Configuration:")
-    database_url = os.getenv("DATABASE_URL")
+    database_url = env.get("DATABASE_URL")
     if database_url:
         print("✅ DATABASE_URL configured")
     else:
@@ -24,7 +35,7 @@ def verify_setup():
     
     # Check API configuration
     print("\n🌐 API Configuration:")
-    api_base_url = os.getenv("API_BASE_URL")
+    api_base_url = env.get("API_BASE_URL")
     if api_base_url:
         print(f"✅ API_BASE_URL: {api_base_url}")
     else:
@@ -32,8 +43,8 @@ def verify_setup():
     
     # Check primary account
     print("\n👤 Primary Account:")
-    primary_email = os.getenv("X_EMAIL")
-    primary_password = os.getenv("X_PASSWORD")
+    primary_email = env.get("X_EMAIL")
+    primary_password = env.get("X_PASSWORD")
     if primary_email and primary_password:
         print(f"✅ Primary account configured: {primary_email}")
     else:
@@ -41,8 +52,8 @@ def verify_setup():
     
     # Check backup account
     print("\n👥 Backup Account:")
-    backup_email = os.getenv("X_EMAIL_BACKUP")
-    backup_password = os.getenv("X_PASSWORD_BACKUP")
+    backup_email = env.get("X_EMAIL_BACKUP")
+    backup_password = env.get("X_PASSWORD_BACKUP")
     if backup_email and backup_password:
         print(f"✅ Backup account configured: {backup_email}")
     else:
@@ -50,10 +61,10 @@ def verify_setup():
     
     # Check Decodo proxy configuration
     print("\n🔗 Decodo Proxy Configuration:")
-    decodo_username = os.getenv("DECODO_USERNAME")
-    decodo_password = os.getenv("DECODO_PASSWORD")
-    decodo_host = os.getenv("DECODO_HOST")
-    decodo_ports = os.getenv("DECODO_PORTS")
+    decodo_username = env.get("DECODO_USERNAME")
+    decodo_password = env.get("DECODO_PASSWORD")
+    decodo_host = env.get("DECODO_HOST")
+    decodo_ports = env.get("DECODO_PORTS")
     
     if all([decodo_username, decodo_password, decodo_host, decodo_ports]):
         print(f"✅ Decodo proxy configured")
@@ -74,17 +85,16 @@ def verify_setup():
         "PROXY_SERVER"
     ]
     
-    tor_found = False
-    for config in tor_configs:
-        if os.getenv(config):
-            print(f"⚠️  Found legacy Tor config: {config}")
-            tor_found = True
+    tor_found = [config for config in tor_configs if env.get(config)]
+    for config in tor_found:
+        print(f"⚠️  Found legacy Tor config: {config}")
     
     if not tor_found:
         print("✅ No legacy Tor configuration found")
     
-    # Check required files
+    # Check required files (one directory listing instead of a stat per file)
     print("\n📁 Required Files:")
+    present_files = {entry.name for entry in os.scandir(".")}
     required_files = [
         "scraper.py",
         "rate_limit_debugger.py",
@@ -93,7 +103,7 @@ def verify_setup():
     ]
     
     for file in required_files:
-        if os.path.exists(file):
+        if file in present_files:
             print(f"✅ {file}")
         else:
             print(f"❌ {file} missing")
@@ -107,7 +117,7 @@ def verify_setup():
     ]
     
     for file in test_files:
-        if os.path.exists(file):
+        if file in present_files:
             print(f"✅ {file}")
         else:
             print(f"❌ {file} missing")
@@ -115,15 +125,7 @@ def verify_setup():
     # Summary
     print(f"\n📋 Setup Summary:")
     
-    issues = []
-    if not database_url:
-        issues.append("Database configuration")
-    if not (primary_email and primary_password):
-        issues.append("Primary account credentials")
-    if not (backup_email and backup_password):
-        issues.append("Backup account credentials")
-    if not all([decodo_username, decodo_password, decodo_host, decodo_ports]):
-        issues.append("Decodo proxy configuration")
+    issues = [label for label, keys in REQUIRED_CONFIG if not all(env.get(key) for key in keys)]
     
     if not issues:
         print("✅ All configurations are properly set up!")
@@ -138,6 +140,13 @@ def verify_setup():
         return False
 
 if __name__ == "__main__":
-    success = verify_setup()
+    # The report is a few dozen short prints; collect them and write once,
+    # even if a check raises, so the lines printed before it aren't lost
+    report = io.StringIO()
+    try:
+        with redirect_stdout(report):
+            success = verify_setup()
+    finally:
+        sys.stdout.write(report.getvalue())
     if not success:
         sys.exit(1)
\ No newline at end of file